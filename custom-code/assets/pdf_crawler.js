@@ -0,0 +1,657 @@
+(function() {
+    console.log('[PDF Crawler] Initializing...');
+    
+    const API_PREFIX = '/api/v1/custom';
+    
+    let floatingButton = null;
+    let uploadModal = null;
+    let currentStep = 'upload';
+    let uploadedFiles = [];
+    let crawledPDFs = [];
+    let excludedPDFs = new Set();
+    
+    // Get auth token from localStorage
+    function getAuthHeaders() {
+        const token = localStorage.getItem('token');
+        return {
+            'Authorization': `Bearer ${token}`
+        };
+    }
+    
+    async function fetchWithAuth(url, options = {}) {
+        options.headers = {
+            ...options.headers,
+            ...getAuthHeaders()
+        };
+        return fetch(url, options);
+    }
+    
+    function createStyles() {
+        if (document.getElementById('pdf-crawler-styles')) return;
+        
+        const style = document.createElement('style');
+        style.id = 'pdf-crawler-styles';
+        style.textContent = `
+            #pdf-crawler-btn {
+                position: fixed;
+                bottom: 24px;
+                right: 24px;
+                z-index: 9999;
+                width: 56px;
+                height: 56px;
+                border-radius: 50%;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white;
+                border: none;
+                cursor: pointer;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                font-size: 24px;
+                box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+                transition: all 0.3s ease;
+            }
+            
+            #pdf-crawler-btn:hover {
+                transform: scale(1.1);
+                box-shadow: 0 6px 20px rgba(0,0,0,0.4);
+            }
+            
+            .pdf-modal-overlay {
+                position: fixed;
+                top: 0;
+                left: 0;
+                right: 0;
+                bottom: 0;
+                background: rgba(0,0,0,0.8);
+                z-index: 10000;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+            }
+            
+            .pdf-modal {
+                background: #1e1e1e;
+                border-radius: 16px;
+                width: 90%;
+                max-width: 700px;
+                max-height: 85vh;
+                overflow: hidden;
+                display: flex;
+                flex-direction: column;
+            }
+            
+            .pdf-modal-header {
+                padding: 20px 24px;
+                border-bottom: 1px solid #333;
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+            }
+            
+            .pdf-modal-header h2 {
+                margin: 0;
+                color: #fff;
+                font-size: 1.25rem;
+            }
+            
+            .pdf-modal-close {
+                background: none;
+                border: none;
+                color: #888;
+                font-size: 24px;
+                cursor: pointer;
+                padding: 0;
+                line-height: 1;
+            }
+            
+            .pdf-modal-close:hover {
+                color: #fff;
+            }
+            
+            .pdf-modal-body {
+                padding: 24px;
+                overflow-y: auto;
+                flex: 1;
+            }
+            
+            .pdf-modal-footer {
+                padding: 16px 24px;
+                border-top: 1px solid #333;
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+            }
+            
+            .pdf-upload-zone {
+                border: 2px dashed #444;
+                border-radius: 12px;
+                padding: 48px 24px;
+                text-align: center;
+                transition: all 0.3s ease;
+                cursor: pointer;
+            }
+            
+            .pdf-upload-zone:hover {
+                border-color: #667eea;
+                background: rgba(102, 126, 234, 0.05);
+            }
+            
+            .pdf-upload-zone h3 {
+                color: #fff;
+                margin: 0 0 8px 0;
+            }
+            
+            .pdf-upload-zone p {
+                color: #888;
+                margin: 0 0 24px 0;
+            }
+            
+            .pdf-upload-btn {
+                display: inline-block;
+                padding: 12px 32px;
+                background: #667eea;
+                color: white;
+                border: none;
+                border-radius: 8px;
+                font-weight: 500;
+                cursor: pointer;
+                transition: background 0.2s;
+            }
+            
+            .pdf-upload-btn:hover {
+                background: #5a6fd6;
+            }
+            
+            .pdf-progress {
+                text-align: center;
+            }
+            
+            .pdf-spinner {
+                width: 48px;
+                height: 48px;
+                border: 4px solid #333;
+                border-top-color: #667eea;
+                border-radius: 50%;
+                animation: spin 1s linear infinite;
+                margin: 0 auto 24px;
+            }
+            
+            @keyframes spin {
+                to { transform: rotate(360deg); }
+            }
+            
+            .pdf-progress-bar {
+                height: 8px;
+                background: #333;
+                border-radius: 4px;
+                overflow: hidden;
+                margin: 16px 0;
+            }
+            
+            .pdf-progress-fill {
+                height: 100%;
+                background: #667eea;
+                border-radius: 4px;
+                transition: width 0.3s ease;
+            }
+            
+            .pdf-list {
+                max-height: 400px;
+                overflow-y: auto;
+            }
+            
+            .pdf-item {
+                display: flex;
+                align-items: center;
+                padding: 12px;
+                background: #2a2a2a;
+                border-radius: 8px;
+                margin-bottom: 8px;
+            }
+            
+            .pdf-item.excluded {
+                opacity: 0.5;
+            }
+            
+            .pdf-item.excluded .pdf-name {
+                text-decoration: line-through;
+            }
+            
+            .pdf-thumb {
+                width: 40px;
+                height: 52px;
+                background: #333;
+                border-radius: 4px;
+                margin-right: 12px;
+                object-fit: cover;
+            }
+            
+            .pdf-info {
+                flex: 1;
+            }
+            
+            .pdf-name {
+                color: #fff;
+                font-weight: 500;
+                display: block;
+            }
+            
+            .pdf-size {
+                color: #888;
+                font-size: 0.85rem;
+            }
+            
+            .pdf-toggle {
+                background: none;
+                border: none;
+                font-size: 20px;
+                cursor: pointer;
+                padding: 8px;
+            }
+            
+            .pdf-submit-btn {
+                padding: 12px 24px;
+                background: #667eea;
+                color: white;
+                border: none;
+                border-radius: 8px;
+                font-weight: 500;
+                cursor: pointer;
+            }
+            
+            .pdf-submit-btn:disabled {
+                opacity: 0.5;
+                cursor: not-allowed;
+            }
+            
+            .pdf-count {
+                color: #888;
+            }
+            
+            .pdf-notification {
+                position: fixed;
+                bottom: 100px;
+                right: 24px;
+                padding: 16px 24px;
+                border-radius: 8px;
+                color: white;
+                z-index: 10001;
+                animation: slideIn 0.3s ease;
+            }
+            
+            .pdf-notification.success { background: #10b981; }
+            .pdf-notification.error { background: #ef4444; }
+            
+            @keyframes slideIn {
+                from { transform: translateX(100%); opacity: 0; }
+                to { transform: translateX(0); opacity: 1; }
+            }
+        `;
+        document.head.appendChild(style);
+    }
+    
+    function showNotification(message, type = 'success') {
+        const notif = document.createElement('div');
+        notif.className = `pdf-notification ${type}`;
+        notif.textContent = message;
+        document.body.appendChild(notif);
+        
+        setTimeout(() => {
+            notif.style.animation = 'slideIn 0.3s ease reverse';
+            setTimeout(() => notif.remove(), 300);
+        }, 3000);
+    }
+    
+    function createButton() {
+        if (floatingButton) return;
+        
+        floatingButton = document.createElement('button');
+        floatingButton.id = 'pdf-crawler-btn';
+        floatingButton.innerHTML = '🕸️';
+        floatingButton.title = 'PDF Web Crawler';
+        floatingButton.onclick = () => openModal();
+        
+        document.body.appendChild(floatingButton);
+    }
+    
+    function openModal() {
+        if (uploadModal) return;
+        
+        uploadModal = document.createElement('div');
+        uploadModal.className = 'pdf-modal-overlay';
+        uploadModal.innerHTML = `
+            <div class="pdf-modal">
+                <div class="pdf-modal-header">
+                    <h2>📄 PDF Web Crawler</h2>
+                    <button class="pdf-modal-close" onclick="window.pdfCrawler.closeModal()">×</button>
+                </div>
+                <div class="pdf-modal-body" id="pdf-modal-body"></div>
+                <div class="pdf-modal-footer" id="pdf-modal-footer" style="display:none"></div>
+            </div>
+        `;
+        
+        document.body.appendChild(uploadModal);
+        uploadModal.onclick = (e) => {
+            if (e.target === uploadModal) closeModal();
+        };
+        
+        showUploadStep();
+    }
+    
+    function closeModal() {
+        flushToggles();
+        if (uploadModal) {
+            uploadModal.remove();
+            uploadModal = null;
+        }
+        currentStep = 'upload';
+        uploadedFiles = [];
+        crawledPDFs = [];
+        excludedPDFs = new Set();
+    }
+    
+    function showUploadStep() {
+        const body = document.getElementById('pdf-modal-body');
+        const footer = document.getElementById('pdf-modal-footer');
+        
+        body.innerHTML = `
+            <div class="pdf-upload-zone" onclick="document.getElementById('pdf-file-input').click()">
+                <h3>Upload PDF Files</h3>
+                <p>Select PDFs to extract and crawl linked documents</p>
+                <button class="pdf-upload-btn">Choose Files</button>
+                <input type="file" id="pdf-file-input" multiple accept=".pdf" 
+                       style="display:none" onchange="window.pdfCrawler.handleFiles(this.files)">
+            </div>
+        `;
+        footer.style.display = 'none';
+    }
+    
+    function showProgressStep(message, progress) {
+        const body = document.getElementById('pdf-modal-body');
+        const footer = document.getElementById('pdf-modal-footer');
+        
+        body.innerHTML = `
+            <div class="pdf-progress">
+                <div class="pdf-spinner"></div>
+                <h3 style="color:#fff;margin:0 0 8px">${message}</h3>
+                <div class="pdf-progress-bar">
+                    <div class="pdf-progress-fill" style="width:${progress}%"></div>
+                </div>
+                <p style="color:#888">${progress}%</p>
+            </div>
+        `;
+        footer.style.display = 'none';
+    }
+    
+    let rowTemplate = null;
+    
+    function getRowTemplate() {
+        if (!rowTemplate) {
+            rowTemplate = document.createElement('template');
+            rowTemplate.innerHTML = `<div class="pdf-item"><img class="pdf-thumb" alt="" loading="lazy" decoding="async"><div class="pdf-info"><span class="pdf-name"></span><span class="pdf-size"></span></div><button class="pdf-toggle"></button></div>`;
+        }
+        return rowTemplate;
+    }
+    
+    function showReviewStep() {
+        const body = document.getElementById('pdf-modal-body');
+        const footer = document.getElementById('pdf-modal-footer');
+        
+        if (crawledPDFs.length === 0) {
+            body.innerHTML = `
+                <div style="text-align:center;padding:48px">
+                    <p style="color:#888;font-size:1.1rem">No PDFs were found from crawling.</p>
+                    <button class="pdf-upload-btn" onclick="window.pdfCrawler.showUploadStep()" style="margin-top:24px">
+                        Try Again
+                    </button>
+                </div>
+            `;
+            footer.style.display = 'none';
+            return;
+        }
+        
+        body.innerHTML = `
+            <div>
+                <p style="color:#888;margin:0 0 16px">Click ❌ to exclude PDFs you don't want:</p>
+                <div class="pdf-list" id="pdf-list"></div>
+            </div>
+        `;
+        
+        // Clone a parsed row per PDF and fill it with textContent, so names are never parsed as HTML
+        const list = document.getElementById('pdf-list');
+        const row = getRowTemplate().content.firstElementChild;
+        const frag = document.createDocumentFragment();
+        for (const pdf of crawledPDFs) {
+            const item = row.cloneNode(true);
+            item.dataset.name = pdf.name;
+            item.classList.toggle('excluded', !!pdf.excluded);
+            const thumb = item.querySelector('.pdf-thumb');
+            if (pdf.preview_url) {
+                thumb.src = pdf.preview_url;
+            } else {
+                const placeholder = document.createElement('div');
+                placeholder.className = 'pdf-thumb';
+                thumb.replaceWith(placeholder);
+            }
+            item.querySelector('.pdf-name').textContent = pdf.name;
+            item.querySelector('.pdf-size').textContent = `${pdf.size_kb} KB`;
+            item.querySelector('.pdf-toggle').textContent = pdf.excluded ? '✓' : '❌';
+            frag.appendChild(item);
+        }
+        list.replaceChildren(frag);
+        
+        // One delegated handler for the whole list instead of one per row
+        list.addEventListener('click', (e) => {
+            const btn = e.target.closest('.pdf-toggle');
+            if (btn) togglePDF(btn.closest('.pdf-item').dataset.name);
+        });
+        
+        updateFooter();
+        footer.style.display = 'flex';
+    }
+    
+    function updateFooter() {
+        const footer = document.getElementById('pdf-modal-footer');
+        const selected = crawledPDFs.filter(p => !excludedPDFs.has(p.name)).length;
+        
+        // Build the footer once, then only patch the count and button state on each toggle
+        let count = footer.querySelector('.pdf-count');
+        let submit = footer.querySelector('.pdf-submit-btn');
+        if (!count || !submit) {
+            footer.innerHTML = `
+                <span class="pdf-count"></span>
+                <button class="pdf-submit-btn">Upload to Open WebUI</button>
+            `;
+            count = footer.querySelector('.pdf-count');
+            submit = footer.querySelector('.pdf-submit-btn');
+            submit.addEventListener('click', () => finalize());
+        }
+        count.textContent = `${selected} of ${crawledPDFs.length} selected`;
+        submit.disabled = selected === 0;
+    }
+    
+    async function handleFiles(files) {
+        if (!files || files.length === 0) return;
+        
+        uploadedFiles = Array.from(files).filter(f => f.name.toLowerCase().endsWith('.pdf'));
+        if (uploadedFiles.length === 0) {
+            showNotification('Please choose PDF files', 'error');
+            return;
+        }
+        showProgressStep('Uploading files...', 10);
+        
+        try {
+            // Clear the previous run, then send each PDF as its own streamed
+            // request body (a few at a time) instead of one giant multipart form
+            const reset = await fetchWithAuth(`${API_PREFIX}/pdf-reset`, { method: 'DELETE' });
+            if (!reset.ok) throw new Error('Could not clear the previous run');
+            
+            let next = 0;
+            let done = 0;
+            const uploadWorker = async () => {
+                while (next < uploadedFiles.length) {
+                    const file = uploadedFiles[next++];
+                    const res = await fetchWithAuth(`${API_PREFIX}/pdf-upload-one`, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/pdf',
+                            'X-Filename': encodeURIComponent(file.name)
+                        },
+                        body: file
+                    });
+                    if (!res.ok) throw new Error(`Upload failed for ${file.name}`);
+                    done++;
+                    showProgressStep(`Uploading files... (${done} of ${uploadedFiles.length})`,
+                        10 + Math.round(done / uploadedFiles.length * 20));
+                }
+            };
+            await Promise.all([uploadWorker(), uploadWorker(), uploadWorker()]);
+            
+            showProgressStep('Crawling PDFs from links...', 30);
+            
+            const response = await fetchWithAuth(`${API_PREFIX}/pdf-crawl`, { method: 'POST' });
+            
+            if (!response.ok) {
+                const error = await response.text();
+                throw new Error(error);
+            }
+            
+            // The crawl runs in the background; follow its real progress
+            await waitForCrawl();
+            
+            showProgressStep('Loading results...', 95);
+            await loadPDFs();
+            showReviewStep();
+            
+        } catch (error) {
+            console.error('[PDF Crawler] Upload error:', error);
+            showNotification('Upload failed: ' + error.message, 'error');
+            showUploadStep();
+        }
+    }
+    
+    // Read the job's server-sent events (via fetch, so the auth header is sent)
+    // until the crawl completes or fails
+    async function waitForCrawl() {
+        const response = await fetchWithAuth(`${API_PREFIX}/pdf-job-events`);
+        if (!response.ok) throw new Error('Job events unavailable');
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            for (const event of events) {
+                if (!event.startsWith('data: ')) continue;
+                const status = JSON.parse(event.slice(6));
+                if (status.status === 'completed') return;
+                if (status.status === 'failed') throw new Error(status.message);
+                showProgressStep(status.message || 'Crawling PDFs from links...', status.progress || 30);
+            }
+        }
+        throw new Error('Crawler status stream ended early');
+    }
+    
+    async function loadPDFs() {
+        const response = await fetchWithAuth(`${API_PREFIX}/pdf-list`);
+        if (!response.ok) throw new Error('Failed to load PDFs');
+        
+        crawledPDFs = await response.json();
+        excludedPDFs = new Set(crawledPDFs.filter(p => p.excluded).map(p => p.name));
+    }
+    
+    // Toggles are applied to the UI at once and sent to the server in batches
+    const pendingToggles = new Map();
+    let flushTimer = null;
+    
+    function togglePDF(name) {
+        const isExcluded = !excludedPDFs.has(name);
+        
+        if (isExcluded) {
+            excludedPDFs.add(name);
+        } else {
+            excludedPDFs.delete(name);
+        }
+        
+        const item = document.querySelector(`.pdf-item[data-name="${CSS.escape(name)}"]`);
+        if (item) {
+            item.classList.toggle('excluded', isExcluded);
+            item.querySelector('.pdf-toggle').textContent = isExcluded ? '✓' : '❌';
+        }
+        
+        const pdf = crawledPDFs.find(p => p.name === name);
+        if (pdf) pdf.excluded = isExcluded;
+        
+        updateFooter();
+        
+        pendingToggles.set(name, isExcluded);
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushToggles, 400);
+    }
+    
+    async function flushToggles() {
+        clearTimeout(flushTimer);
+        flushTimer = null;
+        if (pendingToggles.size === 0) return;
+        
+        const items = Array.from(pendingToggles, ([name, excluded]) => ({ name, excluded }));
+        pendingToggles.clear();
+        
+        try {
+            const response = await fetchWithAuth(`${API_PREFIX}/pdf-toggle-bulk`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(items)
+            });
+            if (!response.ok) throw new Error('Toggle failed');
+        } catch (error) {
+            console.error('[PDF Crawler] Toggle error:', error);
+            showNotification('Could not save selection: ' + error.message, 'error');
+        }
+    }
+    
+    async function finalize() {
+        showProgressStep('Uploading to Open WebUI...', 50);
+        
+        try {
+            // Make sure the server has every exclusion before it picks files
+            await flushToggles();
+            
+            const response = await fetchWithAuth(`${API_PREFIX}/pdf-finalize`, {
+                method: 'POST'
+            });
+            
+            if (!response.ok) throw new Error('Finalize failed');
+            
+            const result = await response.json();
+            showNotification(`Successfully uploaded ${result.moved.length} PDFs!`, 'success');
+            
+            setTimeout(() => closeModal(), 1500);
+            
+        } catch (error) {
+            console.error('[PDF Crawler] Finalize error:', error);
+            showNotification('Failed to upload: ' + error.message, 'error');
+            showReviewStep();
+        }
+    }
+    
+    // Expose functions globally
+    window.pdfCrawler = {
+        closeModal,
+        handleFiles,
+        togglePDF,
+        finalize,
+        showUploadStep
+    };
+    
+    // Initialize
+    createStyles();
+    createButton();
+    
+    console.log('[PDF Crawler] Ready!');
+})();
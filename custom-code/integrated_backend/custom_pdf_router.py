@@ -3,20 +3,25 @@ Custom PDF Router - Integrated into Open WebUI
 Handles PDF upload, web crawling, and knowledge base integration
 """
 
+import asyncio
 import logging
 import json
+import re
 import shutil
 import subprocess
 import sys
 import os
-import io
 import uuid
+import hashlib
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, BackgroundTasks
-from fastapi.responses import FileResponse, Response, PlainTextResponse
+from fastapi.responses import Response, PlainTextResponse, StreamingResponse
 
 from pydantic import BaseModel
 
@@ -26,12 +31,19 @@ from open_webui.models.files import Files, FileForm
 from open_webui.storage.provider import Storage
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 
+# Thumbnails are optional: without PyMuPDF/Pillow the list just has no previews
+try:
+    import fitz  # PyMuPDF
+    from PIL import Image
+except ImportError:
+    fitz = None
+
 log = logging.getLogger(__name__)
-log.setLevel(logging.DEBUG)
+# Per-file and per-line detail is logged at DEBUG; set PDF_CRAWLER_LOG_LEVEL=DEBUG to see it
+log.setLevel(os.environ.get("PDF_CRAWLER_LOG_LEVEL", "INFO").upper())
 
 if not log.handlers:
     handler = logging.StreamHandler()
-    handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
     log.addHandler(handler)
@@ -130,8 +142,13 @@ def save_job_status(job_id: str, status: str, message: str, pdfs_found: int = 0,
         "pdfs_found": pdfs_found,
         "progress": progress
     }
-    with open(paths["job_file"], "w") as f:
-        json.dump(data, f)
+    # Write a temp file and rename it over the job file, so the event stream and
+    # pollers never read a truncated, half-written status. The name is unique
+    # because the crawl thread and request handlers can write concurrently.
+    tmp_file = paths["job_file"].with_name(f"{paths['job_file'].name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_file, paths["job_file"])
 
 # ============================================================================
 # State Management
@@ -149,59 +166,134 @@ def load_state() -> List[dict]:
 
 def save_state(data: List[dict]):
     paths = get_paths()
+    # Machine-read only, so skip the default ", " / ": " padding
     with open(paths["state_file"], "w") as f:
-        json.dump(data, f)
+        json.dump(data, f, separators=(",", ":"))
+
+def clear_folder(folder: Path) -> int:
+    """Delete every file in folder in a single scandir pass, returning the count"""
+    removed = 0
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file():
+                os.unlink(entry.path)
+                removed += 1
+    return removed
 
 # ============================================================================
 # Thumbnail Generation
 # ============================================================================
 
-def generate_thumbnail(pdf_path: Path, thumbnail_dir: Path) -> Optional[Path]:
-    """Generate a thumbnail for a PDF file using PyMuPDF (fitz)"""
+# Bounding box (width, height) thumbnails are rendered into
+THUMBNAIL_SIZE = (200, 260)
+# Lossy WebP is several times smaller than PNG at this size and quicker to encode
+THUMBNAIL_EXT = ".webp"
+
+def generate_thumbnail(pdf_path: Path, thumbnail_dir: Path, existing: Optional[set] = None) -> Optional[Path]:
+    """
+    Generate a thumbnail for a PDF file using PyMuPDF (fitz).
+    existing, when given, is the set of thumbnail names already on disk and
+    replaces the per-call exists() check.
+    """
+    if fitz is None:
+        log.error("PyMuPDF (fitz) or Pillow not installed, cannot generate thumbnails")
+        return None
+    
     try:
-        import fitz  # PyMuPDF
-        
         thumbnail_dir.mkdir(parents=True, exist_ok=True)
-        output_path = thumbnail_dir / f"{pdf_path.stem}.png"
+        output_path = thumbnail_dir / f"{pdf_path.stem}{THUMBNAIL_EXT}"
         
         # Check if thumbnail already exists
-        if output_path.exists():
-            log.debug(f"Thumbnail already exists: {output_path}")
+        if existing is not None:
+            already_rendered = output_path.name in existing
+        else:
+            already_rendered = output_path.exists()
+        if already_rendered:
+            log.debug("Thumbnail already exists: %s", output_path)
             return output_path
         
-        log.info(f"Generating thumbnail for: {pdf_path}")
+        log.debug("Generating thumbnail for: %s", pdf_path)
         
         # Open the PDF
         doc = fitz.open(pdf_path)
-        
-        if len(doc) == 0:
-            log.warning(f"PDF has no pages: {pdf_path}")
+        try:
+            if doc.page_count == 0:
+                log.warning(f"PDF has no pages: {pdf_path}")
+                return None
+            
+            # Get the first page
+            page = doc.load_page(0)
+            
+            # Render page to image (pixmap) straight at thumbnail size, keeping
+            # the aspect ratio, instead of a fixed 0.5 scale of the whole page
+            zoom = min(THUMBNAIL_SIZE[0] / page.rect.width, THUMBNAIL_SIZE[1] / page.rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            
+            # Save as WebP, wrapping the pixmap's buffer without a copy (rows may
+            # be padded to stride); method=0 is libwebp's fastest encoder
+            img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+        finally:
             doc.close()
-            return None
-        
-        # Get the first page
-        page = doc[0]
-        
-        # Render page to image (pixmap)
-        # Use a matrix to scale - 0.5 gives a reasonable thumbnail size
-        mat = fitz.Matrix(0.5, 0.5)
-        pix = page.get_pixmap(matrix=mat)
         
-        # Save as PNG
-        pix.save(str(output_path))
-        
-        doc.close()
+        # Write beside the target and rename it into place, so /pdf-thumbnail
+        # never reads (and caches) a half-written image
+        tmp_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            img.save(tmp_path, "WEBP", quality=80, method=0)
+            os.replace(tmp_path, output_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
         
-        log.info(f"Generated thumbnail: {output_path}")
+        log.debug("Generated thumbnail: %s", output_path)
         return output_path
         
-    except ImportError:
-        log.error("PyMuPDF (fitz) not installed, cannot generate thumbnails")
-        return None
     except Exception as e:
         log.error(f"Error generating thumbnail for {pdf_path}: {e}")
         return None
 
+# New thumbnails are rendered on a single worker thread. PyMuPDF is not
+# thread-safe (concurrent renders can crash the whole server) and holds the GIL
+# while rendering, so more threads would add risk without speed. A process pool
+# would have to fork inside Open WebUI's multi-threaded server or spawn workers
+# that re-import open_webui. Created on first use so importing the router
+# starts no threads.
+_thumb_pool: Optional[ThreadPoolExecutor] = None
+
+def get_thumb_pool() -> ThreadPoolExecutor:
+    global _thumb_pool
+    if _thumb_pool is None:
+        _thumb_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-thumb")
+    return _thumb_pool
+
+async def generate_thumbnails(pdf_paths: List[Path], thumbnail_dir: Path, existing: set) -> List[Optional[Path]]:
+    """
+    Render thumbnails for several PDFs off the event loop, results in input order.
+    PDFs whose thumbnail is in existing are skipped; new ones are added to it.
+    """
+    results = [None] * len(pdf_paths)
+    todo = []
+    for i, pdf in enumerate(pdf_paths):
+        thumb_name = f"{pdf.stem}{THUMBNAIL_EXT}"
+        if thumb_name in existing:
+            results[i] = thumbnail_dir / thumb_name
+        else:
+            todo.append(i)
+    
+    if todo:
+        loop = asyncio.get_running_loop()
+        pool = get_thumb_pool()
+        # The worker re-checks the disk: a running crawl job may have rendered
+        # the same PDF while this request was queued behind it
+        rendered = await asyncio.gather(*(
+            loop.run_in_executor(pool, generate_thumbnail, pdf_paths[i], thumbnail_dir)
+            for i in todo
+        ))
+        for i, thumb in zip(todo, rendered):
+            results[i] = thumb
+            if thumb is not None:
+                existing.add(thumb.name)
+    return results
+
 # ============================================================================
 # Web Scraping
 # ============================================================================
@@ -224,7 +316,7 @@ def find_link_downloader() -> Optional[Path]:
     ]
     
     for loc in script_locations:
-        log.debug(f"Checking for link_downloader.py at: {loc}")
+        log.debug("Checking for link_downloader.py at: %s", loc)
         if loc.exists():
             log.info(f"Found link_downloader.py at: {loc}")
             return loc
@@ -232,6 +324,14 @@ def find_link_downloader() -> Optional[Path]:
     log.warning("link_downloader.py not found in any known location")
     return None
 
+# link_downloader's log line for each PDF it has finished writing
+CRAWLER_SAVED_RE = re.compile(
+    r"(?:Successfully downloaded and saved|Downloaded from Drive via Playwright|Rendered page to PDF): (.+\.pdf)\s*$"
+)
+
+# Longest a finished crawl waits for outstanding thumbnail renders (seconds)
+THUMBNAIL_WAIT_TIMEOUT = 120
+
 def run_crawl_job(job_id: str, input_dir: Path, output_dir: Path):
     """Run the link_downloader.py script to crawl PDFs"""
     log.info(f"[Job {job_id}] Starting crawl job...")
@@ -260,13 +360,23 @@ def run_crawl_job(job_id: str, input_dir: Path, output_dir: Path):
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Thumbnails are rendered on the thumbnail pool while the crawl is still running,
+    # starting with each PDF as soon as it is complete on disk
+    thumbnail_dir = get_paths()["thumbnails"]
+    thumb_jobs = {}
+    
+    def queue_thumbnail(pdf_path: Path):
+        if pdf_path.name not in thumb_jobs:
+            thumb_jobs[pdf_path.name] = get_thumb_pool().submit(generate_thumbnail, pdf_path, thumbnail_dir)
+    
     # IMPORTANT: Copy input PDFs to output directory FIRST
     # This ensures the original uploaded files are always included
     for pdf in input_files:
         dest = output_dir / pdf.name
         if not dest.exists():
             shutil.copy2(pdf, dest)
-            log.info(f"[Job {job_id}] Copied input PDF to output: {pdf.name}")
+            log.debug("[Job %s] Copied input PDF to output: %s", job_id, pdf.name)
+        queue_thumbnail(dest)
     
     cmd = [
         sys.executable,
@@ -287,24 +397,31 @@ def run_crawl_job(job_id: str, input_dir: Path, output_dir: Path):
     env["PYTHONUNBUFFERED"] = "1"
     
     try:
+        # stderr (where the crawler's -v logging goes) is merged into stdout: reading
+        # only stdout while stderr's pipe filled up would deadlock both processes
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
             cwd=str(script_path.parent),
             env=env
         )
         
         progress = 30
-        stdout_lines = []
+        # Only the tail is kept, for the error log if the crawler fails
+        output_tail = deque(maxlen=20)
         
         # Read stdout
         for line in process.stdout:
             line = line.strip()
             if line:
-                log.info(f"[Job {job_id}] STDOUT: {line}")
-                stdout_lines.append(line)
+                log.debug("[Job %s] STDOUT: %s", job_id, line)
+                output_tail.append(line)
+                
+                match = CRAWLER_SAVED_RE.search(line)
+                if match:
+                    queue_thumbnail(output_dir / Path(match.group(1)).name)
                 
                 if "Downloading" in line or "Downloaded" in line or "Found" in line:
                     progress = min(progress + 5, 90)
@@ -314,16 +431,14 @@ def run_crawl_job(job_id: str, input_dir: Path, output_dir: Path):
         # Wait for process to complete
         process.wait()
         
-        # Read any stderr
-        stderr = process.stderr.read()
-        if stderr:
-            log.error(f"[Job {job_id}] STDERR: {stderr}")
-        
         log.info(f"[Job {job_id}] Process exited with code: {process.returncode}")
+        if process.returncode != 0:
+            log.error(f"[Job {job_id}] Crawler output tail:\n" + "\n".join(output_tail))
         
         pdf_count = len(list(output_dir.glob("*.pdf")))
         log.info(f"[Job {job_id}] PDFs in output directory: {pdf_count}")
-        log.info(f"[Job {job_id}] Output files: {[f.name for f in output_dir.glob('*.pdf')]}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[Job %s] Output files: %s", job_id, [f.name for f in output_dir.glob("*.pdf")])
         
         # If somehow no PDFs in output (shouldn't happen since we copied input first)
         if pdf_count == 0:
@@ -331,9 +446,20 @@ def run_crawl_job(job_id: str, input_dir: Path, output_dir: Path):
             for pdf in input_dir.glob("*.pdf"):
                 dest = output_dir / pdf.name
                 shutil.copy2(pdf, dest)
-                log.info(f"[Job {job_id}] Copied: {pdf.name} -> {dest}")
+                log.debug("[Job %s] Copied: %s -> %s", job_id, pdf.name, dest)
             pdf_count = len(list(output_dir.glob("*.pdf")))
         
+        # Catch anything the crawler saved without a recognised log line, then wait
+        # so the review page's first listing finds every thumbnail already on disk
+        for pdf in output_dir.glob("*.pdf"):
+            queue_thumbnail(pdf)
+        # Bounded, so one stuck render can't leave the job "running" forever
+        done, not_done = wait(thumb_jobs.values(), timeout=THUMBNAIL_WAIT_TIMEOUT)
+        log.info(f"[Job {job_id}] Rendered {len(done)} thumbnails")
+        if not_done:
+            pending = sorted(name for name, job in thumb_jobs.items() if job in not_done)
+            log.warning(f"[Job {job_id}] {len(pending)} thumbnails still rendering after {THUMBNAIL_WAIT_TIMEOUT}s: {pending}")
+        
         log.info(f"[Job {job_id}] Completed with {pdf_count} PDFs")
         save_job_status(job_id, "completed", f"Found {pdf_count} PDFs", pdf_count, 100)
         
@@ -343,12 +469,16 @@ def run_crawl_job(job_id: str, input_dir: Path, output_dir: Path):
         log.error(f"[Job {job_id}] Traceback: {traceback.format_exc()}")
         
         # Make sure input files are in output even on error
-        for pdf in input_dir.glob("*.pdf"):
-            dest = output_dir / pdf.name
-            if not dest.exists():
-                shutil.copy2(pdf, dest)
+        try:
+            for pdf in input_dir.glob("*.pdf"):
+                dest = output_dir / pdf.name
+                if not dest.exists():
+                    shutil.copy2(pdf, dest)
+        except OSError as copy_error:
+            log.error(f"[Job {job_id}] Could not copy uploaded files: {copy_error}")
         pdf_count = len(list(output_dir.glob("*.pdf")))
         
+        # Always finish the job so pollers and the event stream stop waiting
         save_job_status(job_id, "completed", f"Crawler error. Using {pdf_count} uploaded files.", pdf_count, 100)
 
 # ============================================================================
@@ -388,10 +518,157 @@ def add_file_to_knowledge_base(file_id: str, knowledge_id: str, user_id: str) ->
         return {"success": False, "error": str(e)}
 
 
+# Files stored and processed at once during finalize
+FINALIZE_CONCURRENCY = 4
+
+
+def store_pdf_file(request: Request, source: Path, user) -> Optional[str]:
+    """
+    Upload one PDF to Open WebUI storage, create its file record and extract its
+    content for RAG. Returns the new file id, or None if the record wasn't created.
+    """
+    # Generate unique ID (like files.py does)
+    file_id = str(uuid.uuid4())
+    original_name = source.name
+    
+    # Create storage filename with UUID prefix (like files.py line 202)
+    storage_filename = f"{file_id}_{original_name}"
+    
+    # Upload to storage
+    log.debug("Uploading to storage: %s", storage_filename)
+    
+    tags = {
+        "OpenWebUI-User-Email": user.email,
+        "OpenWebUI-User-Id": user.id,
+        "OpenWebUI-User-Name": user.name,
+        "OpenWebUI-File-Id": file_id,
+    }
+    
+    # Hand Storage the open file rather than a BytesIO copy of its contents
+    with open(source, "rb") as file_obj:
+        size = os.fstat(file_obj.fileno()).st_size
+        _, file_path = Storage.upload_file(file_obj, storage_filename, tags)
+    log.debug("Storage path: %s (%d bytes)", file_path, size)
+    
+    # Create file record with proper metadata structure (matching files.py lines 214-229)
+    file_record = Files.insert_new_file(
+        user.id,
+        FileForm(
+            id=file_id,
+            filename=original_name,  # Original filename for display
+            path=file_path,          # Storage path with UUID prefix
+            data={
+                "status": "pending"  # Will be updated after processing
+            },
+            meta={
+                "name": original_name,           # CRITICAL: This is what displays in UI
+                "content_type": "application/pdf",
+                "size": size,
+                "source": "pdf_crawler",
+            }
+        )
+    )
+    
+    if not file_record:
+        log.error(f"Failed to create file record for {original_name}")
+        return None
+    
+    log.debug("Created file record for %s with ID %s", original_name, file_id)
+    
+    # CRITICAL: Process the file to extract content for RAG
+    # This is what openwebui_uploader.py does via the API with process=true
+    try:
+        log.debug("Processing file for content extraction: %s", file_id)
+        process_file(
+            request,
+            ProcessFileForm(file_id=file_id),
+            user=user
+        )
+        log.debug("File processed successfully: %s", file_id)
+    except Exception as proc_error:
+        log.error(f"Error processing file {file_id}: {proc_error}")
+        # Update file status to failed
+        Files.update_file_data_by_id(
+            file_id,
+            {
+                "status": "failed",
+                "error": str(proc_error)
+            }
+        )
+    
+    return file_id
+
+
+def add_pdf_to_knowledge(request: Request, knowledge_id: str, file_id: str, user):
+    """Add a stored file to a knowledge base through the knowledge router's logic"""
+    from open_webui.routers.knowledge import add_file_to_knowledge_by_id, KnowledgeFileIdForm
+    
+    # Create a mock form_data for the knowledge endpoint
+    kb_form = KnowledgeFileIdForm(file_id=file_id)
+    
+    # Call the knowledge base add function
+    return add_file_to_knowledge_by_id(
+        request=request,
+        id=knowledge_id,
+        form_data=kb_form,
+        user=user
+    )
+
+
+async def add_pdfs_to_knowledge(request: Request, knowledge_id: str, file_ids: List[str], user) -> dict:
+    """
+    Add several stored files to a knowledge base with the knowledge router's
+    batch endpoint. Returns {file_id: error} for the files it reported as
+    failed. Raises ImportError on Open WebUI versions without it.
+    """
+    from open_webui.routers.knowledge import add_files_to_knowledge_batch, KnowledgeFileIdForm
+    
+    kwargs = dict(
+        request=request,
+        id=knowledge_id,
+        form_data=[KnowledgeFileIdForm(file_id=file_id) for file_id in file_ids],
+        user=user
+    )
+    # The endpoint is async in newer Open WebUI releases and sync in older ones
+    if asyncio.iscoroutinefunction(add_files_to_knowledge_batch):
+        result = await add_files_to_knowledge_batch(**kwargs)
+    else:
+        result = await asyncio.to_thread(add_files_to_knowledge_batch, **kwargs)
+    return batch_failures(result, file_ids)
+
+
+def batch_failures(result, file_ids: List[str]) -> dict:
+    """
+    Per-file failures from a batch add. The endpoint doesn't raise for these;
+    it lists them as "<file_id>: <error>" strings under warnings["errors"].
+    """
+    warnings = result.get("warnings") if isinstance(result, dict) else getattr(result, "warnings", None)
+    if not warnings:
+        return {}
+    entries = warnings.get("errors", []) if isinstance(warnings, dict) else getattr(warnings, "errors", [])
+    
+    requested = set(file_ids)
+    failed = {}
+    for entry in entries or []:
+        file_id, _, error = str(entry).partition(": ")
+        if file_id in requested:
+            failed[file_id] = error
+        else:
+            log.warning(f"Unrecognised knowledge batch error: {entry}")
+    return failed
+
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
 
+def save_upload(file: UploadFile, file_path: Path):
+    """Copy an upload's spooled file to disk in 1 MiB chunks instead of reading it whole"""
+    file.file.seek(0)
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, length=1024 * 1024)
+
+
 @router.post("/pdf-upload", response_model=UploadResponse)
 async def upload_and_crawl(
     request: Request,
@@ -400,6 +677,7 @@ async def upload_and_crawl(
     user=Depends(get_verified_user)
 ):
     """Upload PDFs and start background crawling job"""
+    invalidate_pdf_list_cache()
     paths = get_paths()
     
     log.info(f"=== PDF Upload started by user {user.id} ===")
@@ -410,24 +688,27 @@ async def upload_and_crawl(
         if old_file.exists():
             old_file.unlink()
     
-    for folder in [paths["scraped"], paths["thumbnails"], paths["input_dir"]]:
-        for f in folder.glob("*"):
-            if f.is_file():
-                f.unlink()
+    removed = sum(clear_folder(folder) for folder in [paths["scraped"], paths["thumbnails"], paths["input_dir"]])
+    load_thumbnail.cache_clear()
+    log.info(f"Cleared {removed} files from the previous run")
     
     saved_count = 0
     for file in files:
         if file.filename and file.filename.lower().endswith('.pdf'):
             file_path = paths["input_dir"] / file.filename
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
+            await asyncio.to_thread(save_upload, file, file_path)
             saved_count += 1
-            log.info(f"Saved: {file.filename}")
+            log.debug("Saved: %s", file.filename)
     
     if saved_count == 0:
         raise HTTPException(status_code=400, detail="No PDF files uploaded")
     
+    return start_crawl_job(background_tasks, job_id, saved_count)
+
+
+def start_crawl_job(background_tasks: BackgroundTasks, job_id: str, saved_count: int) -> UploadResponse:
+    """Record a pending job and schedule the crawler over the input folder"""
+    paths = get_paths()
     save_job_status(job_id, "pending", f"Uploaded {saved_count} files, starting crawler...", 0, 5)
     
     background_tasks.add_task(
@@ -444,6 +725,60 @@ async def upload_and_crawl(
     )
 
 
+# Disk writes are batched to this size while streaming a raw upload body
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+@router.post("/pdf-upload-one")
+async def upload_one(
+    request: Request,
+    user=Depends(get_verified_user)
+):
+    """Stream one raw PDF request body (named by X-Filename) into the input folder"""
+    invalidate_pdf_list_cache()
+    paths = get_paths()
+    
+    filename = Path(unquote(request.headers.get("x-filename", ""))).name
+    if not filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="X-Filename must name a .pdf file")
+    
+    file_path = paths["input_dir"] / filename
+    size = 0
+    buffer = bytearray()
+    # Disk I/O runs in a worker thread so large uploads don't stall the event loop
+    f = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                await asyncio.to_thread(f.write, buffer)
+                size += len(buffer)
+                buffer.clear()
+        await asyncio.to_thread(f.write, buffer)
+        size += len(buffer)
+    finally:
+        await asyncio.to_thread(f.close)
+    
+    log.debug("Saved: %s (%d bytes)", filename, size)
+    return {"name": filename, "size": size}
+
+
+@router.post("/pdf-crawl", response_model=UploadResponse)
+async def start_crawl(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    user=Depends(get_verified_user)
+):
+    """Start crawling the PDFs sent through /pdf-upload-one"""
+    paths = get_paths()
+    saved_count = sum(1 for _ in paths["input_dir"].glob("*.pdf"))
+    if saved_count == 0:
+        raise HTTPException(status_code=400, detail="No PDF files uploaded")
+    
+    log.info(f"=== PDF crawl started by user {user.id} ({saved_count} files) ===")
+    return start_crawl_job(background_tasks, str(uuid.uuid4())[:8], saved_count)
+
+
 @router.get("/pdf-job-status", response_model=JobStatusResponse)
 async def get_job_status(
     request: Request,
@@ -454,6 +789,68 @@ async def get_job_status(
     return JobStatusResponse(**status)
 
 
+# How often the event stream checks the job file for changes
+JOB_EVENT_INTERVAL = 0.5
+
+
+@router.get("/pdf-job-events")
+async def job_events(
+    request: Request,
+    user=Depends(get_verified_user)
+):
+    """Stream job status changes as server-sent events until the job finishes"""
+    job_file = get_paths()["job_file"]
+    
+    async def event_stream():
+        last_version = -1
+        while not await request.is_disconnected():
+            # A stat per tick; the file is only re-read when the crawler rewrote it.
+            # Every save renames a new file into place, so the inode changes even
+            # when two writes land in the same mtime tick
+            try:
+                st = job_file.stat()
+                version = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                version = None
+            if version != last_version:
+                last_version = version
+                status = load_job_status()
+                yield f"data: {json.dumps(status)}\n\n"
+                if status["status"] in ("completed", "failed"):
+                    return
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Keep proxies and the compression middleware from buffering events
+            "Content-Encoding": "identity",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+# Last /pdf-list result, reused while none of the folders it reads have changed
+_pdf_list_cache = {"key": None, "value": None}
+
+
+def pdf_list_cache_key(paths: dict) -> tuple:
+    """mtimes of the scraped folder, thumbnail folder and state file"""
+    key = []
+    for path in (paths["scraped"], paths["thumbnails"], paths["state_file"]):
+        try:
+            key.append(path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            key.append(None)
+    return tuple(key)
+
+
+def invalidate_pdf_list_cache():
+    _pdf_list_cache["key"] = None
+
+
 @router.get("/pdf-list", response_model=List[PDFListItem])
 async def list_pdfs(
     request: Request,
@@ -462,47 +859,80 @@ async def list_pdfs(
     """List all crawled PDFs"""
     paths = get_paths()
     
-    pdf_files = list(paths["scraped"].glob("*.pdf"))
+    # Repeat listings of an unchanged crawl cost three stats. The key is taken
+    # before anything is read, so a write that lands mid-listing can't end up
+    # cached under its own, newer mtime
+    cache_key = pdf_list_cache_key(paths)
+    if cache_key == _pdf_list_cache["key"]:
+        return _pdf_list_cache["value"]
+    
+    # One directory read per folder: scandir yields names directly, and the
+    # thumbnail folder becomes a set instead of an exists() call per PDF
+    with os.scandir(paths["scraped"]) as entries:
+        pdf_files = [
+            (entry.name, entry.stat().st_size)
+            for entry in entries
+            if entry.name.endswith(".pdf") and entry.is_file()
+        ]
     log.info(f"Listing {len(pdf_files)} PDFs from {paths['scraped']}")
     
     if not pdf_files:
         return []
     
+    with os.scandir(paths["thumbnails"]) as entries:
+        thumb_names = {entry.name for entry in entries}
+    
     saved_state = load_state()
     exclusions = {item["name"]: item.get("excluded", False) for item in saved_state}
     
+    # Render every missing thumbnail at once instead of one PDF at a time
+    generated = await generate_thumbnails(
+        [paths["scraped"] / name for name, _ in pdf_files], paths["thumbnails"], thumb_names
+    )
+    failed = {name for (name, _), thumb in zip(pdf_files, generated) if thumb is None}
+    
     result = []
     new_state = []
     
-    for pdf in pdf_files:
-        thumb_path = paths["thumbnails"] / f"{pdf.stem}.png"
-        thumbnail_generated = False
+    for name, size in pdf_files:
+        is_excluded = exclusions.get(name, False)
         
-        if not thumb_path.exists():
-            generated = generate_thumbnail(pdf, paths["thumbnails"])
-            thumbnail_generated = generated is not None
-        else:
-            thumbnail_generated = True
-        
-        is_excluded = exclusions.get(pdf.name, False)
-        
-        new_state.append({"name": pdf.name, "excluded": is_excluded})
+        new_state.append({"name": name, "excluded": is_excluded})
         
         preview_url = None
-        if thumbnail_generated and thumb_path.exists():
-            preview_url = f"/api/v1/custom/pdf-thumbnail/{pdf.stem}.png"
+        if name not in failed:
+            preview_url = f"/api/v1/custom/pdf-thumbnail/{os.path.splitext(name)[0]}{THUMBNAIL_EXT}"
         
         result.append(PDFListItem(
-            name=pdf.name,
-            size_kb=round(pdf.stat().st_size / 1024, 1),
+            name=name,
+            size_kb=round(size / 1024, 1),
             excluded=is_excluded,
             preview_url=preview_url
         ))
     
-    save_state(new_state)
+    if new_state != saved_state:
+        save_state(new_state)
+    
+    # Only cache a listing nothing changed under. When this call rendered
+    # thumbnails or saved state the next one rebuilds once, finds nothing to
+    # write and is cached
+    if pdf_list_cache_key(paths) == cache_key:
+        _pdf_list_cache["key"] = cache_key
+        _pdf_list_cache["value"] = result
     return result
 
 
+@lru_cache(maxsize=512)
+def load_thumbnail(path: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Thumbnail bytes and ETag, cached in memory. mtime and size are part of the
+    key so a re-rendered thumbnail with a reused name is never served stale.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+
+
 @router.get("/pdf-thumbnail/{filename}")
 async def get_thumbnail(
     filename: str,
@@ -512,19 +942,24 @@ async def get_thumbnail(
     """Serve thumbnail images"""
     paths = get_paths()
     
-    if not filename.endswith('.png'):
-        filename = f"{filename}.png"
+    if not filename.endswith(THUMBNAIL_EXT):
+        filename = f"{filename}{THUMBNAIL_EXT}"
     
     thumb_path = paths["thumbnails"] / filename
     
-    if not thumb_path.exists():
+    try:
+        st = thumb_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Thumbnail not found: {filename}")
     
-    return FileResponse(
-        thumb_path, 
-        media_type="image/png",
-        headers={"Cache-Control": "max-age=3600"}
-    )
+    data, etag = load_thumbnail(str(thumb_path), st.st_mtime_ns, st.st_size)
+    # Names are reused across crawls, so browsers revalidate rather than treat them as immutable
+    headers = {"Cache-Control": "private, max-age=3600", "ETag": etag}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=data, media_type="image/webp", headers=headers)
 
 
 @router.patch("/pdf-toggle/{name}")
@@ -535,11 +970,14 @@ async def toggle_exclusion(
     user=Depends(get_verified_user)
 ):
     """Toggle PDF exclusion status"""
+    invalidate_pdf_list_cache()
     state = load_state()
     
     found = False
+    changed = True
     for pdf in state:
         if pdf["name"] == name:
+            changed = pdf.get("excluded", False) != item.excluded
             pdf["excluded"] = item.excluded
             found = True
             break
@@ -547,9 +985,38 @@ async def toggle_exclusion(
     if not found:
         state.append({"name": name, "excluded": item.excluded})
     
-    save_state(state)
+    # A repeated click that doesn't change anything skips the full-file rewrite
+    if changed:
+        save_state(state)
     return {"name": name, "excluded": item.excluded}
 
+
+@router.post("/pdf-toggle-bulk")
+async def toggle_exclusion_bulk(
+    items: List[PDFItem],
+    request: Request,
+    user=Depends(get_verified_user)
+):
+    """Apply several exclusion changes with a single state write"""
+    invalidate_pdf_list_cache()
+    state = load_state()
+    by_name = {pdf["name"]: pdf for pdf in state}
+    
+    changed = False
+    for item in items:
+        if item.name in by_name:
+            changed |= by_name[item.name].get("excluded", False) != item.excluded
+            by_name[item.name]["excluded"] = item.excluded
+        else:
+            entry = {"name": item.name, "excluded": item.excluded}
+            state.append(entry)
+            by_name[item.name] = entry
+            changed = True
+    
+    if changed:
+        save_state(state)
+    return {"updated": len(items)}
+
 @router.post("/pdf-finalize", response_model=FinalizeResponse)
 async def finalize_upload(
     request: Request,
@@ -560,13 +1027,15 @@ async def finalize_upload(
     Upload selected PDFs to Open WebUI and optionally add to a knowledge base.
     Similar to openwebui_uploader.py but integrated directly.
     """
+    invalidate_pdf_list_cache()
     paths = get_paths()
     state = load_state()
     
-    log.info(f"=== Finalize Upload ===")
-    log.info(f"Loaded state: {state}")
-    log.info(f"Scraped dir: {paths['scraped']}")
-    log.info(f"Files in scraped: {[f.name for f in paths['scraped'].glob('*.pdf')]}")
+    log.info("=== Finalize Upload ===")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Loaded state: %s", state)
+        log.debug("Scraped dir: %s", paths["scraped"])
+        log.debug("Files in scraped: %s", [f.name for f in paths["scraped"].glob("*.pdf")])
     
     # Get knowledge_id from request body if provided
     knowledge_id = None
@@ -578,10 +1047,10 @@ async def finalize_upload(
         log.warning("State is empty, building from scraped directory...")
         for pdf in paths["scraped"].glob("*.pdf"):
             state.append({"name": pdf.name, "excluded": False})
-        log.info(f"Built state from files: {state}")
+        log.debug("Built state from files: %s", state)
     
     included = [pdf for pdf in state if not pdf.get("excluded", False)]
-    log.info(f"Included PDFs: {included}")
+    log.info(f"{len(included)} of {len(state)} PDFs included")
     
     if not included:
         raise HTTPException(status_code=400, detail="No PDFs selected")
@@ -591,127 +1060,83 @@ async def finalize_upload(
     added_to_kb = []
     errors = []
     
-    for pdf_data in included:
+    semaphore = asyncio.Semaphore(FINALIZE_CONCURRENCY)
+    
+    async def store(pdf_data):
+        """Returns (file_id, error) for one PDF"""
         source = paths["scraped"] / pdf_data["name"]
-        log.info(f"Processing: {pdf_data['name']}, source exists: {source.exists()}")
+        log.debug("Processing: %s", pdf_data["name"])
         
         if not source.exists():
             log.error(f"Source file not found: {source}")
-            errors.append({"filename": pdf_data["name"], "error": "File not found"})
+            return None, "File not found"
+        
+        async with semaphore:
+            try:
+                file_id = await asyncio.to_thread(store_pdf_file, request, source, user)
+            except Exception as e:
+                log.error(f"Error processing {pdf_data['name']}: {e}")
+                import traceback
+                log.error(traceback.format_exc())
+                return None, str(e)
+        
+        if file_id is None:
+            return None, "Failed to create file record"
+        return file_id, None
+    
+    # Storage writes and content extraction are independent per file, so run them concurrently
+    outcomes = await asyncio.gather(*(store(pdf_data) for pdf_data in included))
+    
+    stored = []
+    for pdf_data, (file_id, error) in zip(included, outcomes):
+        if error:
+            errors.append({"filename": pdf_data["name"], "error": error})
             continue
         
+        moved.append(pdf_data["name"])
+        uploaded.append(file_id)
+        stored.append((pdf_data["name"], file_id))
+    
+    # If knowledge_id provided, add to knowledge base
+    if knowledge_id and stored:
         try:
-            # Read file content
-            with open(source, "rb") as f:
-                content = f.read()
-            
-            log.info(f"Read {len(content)} bytes from {source}")
-            
-            # Generate unique ID (like files.py does)
-            file_id = str(uuid.uuid4())
-            original_name = pdf_data["name"]
-            
-            # Create storage filename with UUID prefix (like files.py line 202)
-            storage_filename = f"{file_id}_{original_name}"
-            
-            # Upload to storage
-            log.info(f"Uploading to storage: {storage_filename}")
-            
-            file_obj = io.BytesIO(content)
-            tags = {
-                "OpenWebUI-User-Email": user.email,
-                "OpenWebUI-User-Id": user.id,
-                "OpenWebUI-User-Name": user.name,
-                "OpenWebUI-File-Id": file_id,
-            }
-            
-            _, file_path = Storage.upload_file(file_obj, storage_filename, tags)
-            log.info(f"Storage path: {file_path}")
-            
-            # Create file record with proper metadata structure (matching files.py lines 214-229)
-            file_record = Files.insert_new_file(
-                user.id,
-                FileForm(
-                    id=file_id,
-                    filename=original_name,  # Original filename for display
-                    path=file_path,          # Storage path with UUID prefix
-                    data={
-                        "status": "pending"  # Will be updated after processing
-                    },
-                    meta={
-                        "name": original_name,           # CRITICAL: This is what displays in UI
-                        "content_type": "application/pdf",
-                        "size": len(content),
-                        "source": "pdf_crawler",
-                    }
-                )
-            )
-            
-            if file_record:
-                moved.append(pdf_data["name"])
-                uploaded.append(file_id)
-                log.info(f"SUCCESS: Created file record for {original_name} with ID {file_id}")
-                
-                # CRITICAL: Process the file to extract content for RAG
-                # This is what openwebui_uploader.py does via the API with process=true
+            # One batch call instead of one knowledge-base update per file
+            failed = await add_pdfs_to_knowledge(request, knowledge_id, [file_id for _, file_id in stored], user)
+            # Only files the batch didn't report as failed count as added
+            for name, file_id in stored:
+                if file_id in failed:
+                    errors.append({
+                        "filename": name, 
+                        "error": f"KB add failed: {failed[file_id]}"
+                    })
+                else:
+                    added_to_kb.append(file_id)
+            log.info(f"Added {len(stored) - len(failed)} of {len(stored)} PDFs to knowledge base {knowledge_id}")
+        except ImportError:
+            # Open WebUI without the batch endpoint: add one at a time. These stay
+            # sequential because each one rewrites the KB's file list
+            for name, file_id in stored:
                 try:
-                    log.info(f"Processing file for content extraction: {file_id}")
-                    process_file(
-                        request,
-                        ProcessFileForm(file_id=file_id),
-                        user=user
-                    )
-                    log.info(f"File processed successfully: {file_id}")
-                except Exception as proc_error:
-                    log.error(f"Error processing file {file_id}: {proc_error}")
-                    # Update file status to failed
-                    Files.update_file_data_by_id(
-                        file_id,
-                        {
-                            "status": "failed",
-                            "error": str(proc_error)
-                        }
-                    )
-                
-                # If knowledge_id provided, add to knowledge base
-                if knowledge_id:
-                    try:
-                        # Use the knowledge router's add file endpoint logic
-                        from open_webui.routers.knowledge import add_file_to_knowledge_by_id, KnowledgeFileIdForm
-                        
-                        # Create a mock form_data for the knowledge endpoint
-                        kb_form = KnowledgeFileIdForm(file_id=file_id)
-                        
-                        # Call the knowledge base add function
-                        kb_result = add_file_to_knowledge_by_id(
-                            request=request,
-                            id=knowledge_id,
-                            form_data=kb_form,
-                            user=user
-                        )
-                        added_to_kb.append(file_id)
-                        log.info(f"Added {original_name} to knowledge base {knowledge_id}")
-                    except Exception as kb_error:
-                        log.error(f"Error adding to KB: {kb_error}")
-                        errors.append({
-                            "filename": pdf_data["name"], 
-                            "error": f"KB add failed: {str(kb_error)}"
-                        })
-            else:
-                log.error(f"Failed to create file record for {original_name}")
-                errors.append({"filename": pdf_data["name"], "error": "Failed to create file record"})
-                
-        except Exception as e:
-            log.error(f"Error processing {pdf_data['name']}: {e}")
-            import traceback
-            log.error(traceback.format_exc())
-            errors.append({"filename": pdf_data["name"], "error": str(e)})
+                    await asyncio.to_thread(add_pdf_to_knowledge, request, knowledge_id, file_id, user)
+                    added_to_kb.append(file_id)
+                    log.debug("Added %s to knowledge base %s", name, knowledge_id)
+                except Exception as kb_error:
+                    log.error(f"Error adding to KB: {kb_error}")
+                    errors.append({
+                        "filename": name, 
+                        "error": f"KB add failed: {str(kb_error)}"
+                    })
+        except Exception as kb_error:
+            log.error(f"Error adding to KB: {kb_error}")
+            for name, _ in stored:
+                errors.append({
+                    "filename": name, 
+                    "error": f"KB add failed: {str(kb_error)}"
+                })
     
     # Cleanup
-    log.info("Cleaning up...")
-    for pdf in paths["scraped"].glob("*.pdf"):
-        pdf.unlink()
-        log.info(f"Deleted: {pdf}")
+    removed = clear_folder(paths["scraped"])
+    log.info(f"Cleaned up {removed} files from the scraped folder")
     
     for f in [paths["state_file"], paths["job_file"]]:
         if f.exists():
@@ -722,7 +1147,7 @@ async def finalize_upload(
         message += f", added {len(added_to_kb)} to knowledge base"
     
     log.info(f"=== Finalize Complete: {message} ===")
-    log.info(f"Moved: {moved}, Errors: {errors}")
+    log.debug("Moved: %s, Errors: %s", moved, errors)
     
     return FinalizeResponse(
         message=message,
@@ -738,16 +1163,16 @@ async def reset_state(
     user=Depends(get_verified_user)
 ):
     """Reset the crawler state"""
+    invalidate_pdf_list_cache()
     paths = get_paths()
     
     for f in [paths["state_file"], paths["job_file"]]:
         if f.exists():
             f.unlink()
     
-    for folder in [paths["thumbnails"], paths["scraped"], paths["input_dir"]]:
-        for file in folder.glob("*"):
-            if file.is_file():
-                file.unlink()
+    removed = sum(clear_folder(folder) for folder in [paths["thumbnails"], paths["scraped"], paths["input_dir"]])
+    load_thumbnail.cache_clear()
+    log.info(f"Reset: cleared {removed} files")
     
     return {"message": "State reset"}
 
@@ -792,7 +1217,7 @@ async def get_injection_script():
     let uploadModal = null;
     let crawledPDFs = [];
     let excludedPDFs = new Set();
-    let pollInterval = null;
+    let jobEvents = null;
     let currentKnowledgeId = null;
     
     function detectKnowledgeId() {
@@ -1037,13 +1462,18 @@ async def get_injection_script():
         }
     }
     
-    let lastPath = window.location.pathname;
-    setInterval(function() {
-        if (window.location.pathname !== lastPath) {
-            lastPath = window.location.pathname;
-            updateButtonStyle();
-        }
-    }, 500);
+    // Re-style the button on SPA navigation instead of polling the URL:
+    // wrap the history API so pushState/replaceState also emit an event
+    ['pushState', 'replaceState'].forEach(function(fn) {
+        var original = history[fn];
+        history[fn] = function() {
+            var result = original.apply(this, arguments);
+            window.dispatchEvent(new Event('pdfcrawler:locationchange'));
+            return result;
+        };
+    });
+    window.addEventListener('popstate', updateButtonStyle);
+    window.addEventListener('pdfcrawler:locationchange', updateButtonStyle);
     
     function openModal() {
         if (uploadModal) return;
@@ -1066,7 +1496,8 @@ async def get_injection_script():
     }
     
     function closeModal() {
-        if (pollInterval) { clearInterval(pollInterval); pollInterval = null; }
+        flushToggles();
+        if (jobEvents) { jobEvents.abort(); jobEvents = null; }
         if (uploadModal) { uploadModal.remove(); uploadModal = null; }
         crawledPDFs = [];
         excludedPDFs = new Set();
@@ -1129,11 +1560,11 @@ async def get_injection_script():
         }
         
         var html = getKbNoticeHtml() +
-            '<div><p style="color:#888;margin:0 0 16px">Found ' + crawledPDFs.length + ' PDFs. Click ❌ to exclude:</p><div class="pdf-list">';
+            '<div><p style="color:#888;margin:0 0 16px">Found ' + crawledPDFs.length + ' PDFs. Click ❌ to exclude:</p><div class="pdf-list" id="pdf-list">';
         crawledPDFs.forEach(function(pdf) {
             var isExcluded = excludedPDFs.has(pdf.name);
             var thumbContent = pdf.preview_url 
-                ? '<img src="' + pdf.preview_url + '" alt="" onerror="this.parentElement.innerHTML=\'📄\'">'
+                ? '<img src="' + pdf.preview_url + '" alt="" loading="lazy" decoding="async" onerror="this.parentElement.innerHTML=\'📄\'">'
                 : '📄';
             
             html += '<div class="pdf-item' + (isExcluded ? ' excluded' : '') + '" data-name="' + escapeHtml(pdf.name) + '">' +
@@ -1145,9 +1576,11 @@ async def get_injection_script():
         html += '</div></div>';
         body.innerHTML = html;
         
-        document.querySelectorAll('.pdf-toggle').forEach(function(btn) {
-            btn.onclick = function() { togglePDF(this.getAttribute('data-name')); };
-        });
+        // One delegated handler for the whole list instead of one per row
+        document.getElementById('pdf-list').onclick = function(e) {
+            var btn = e.target.closest('.pdf-toggle');
+            if (btn) togglePDF(btn.getAttribute('data-name'));
+        };
         
         updateFooter();
         footer.style.display = 'flex';
@@ -1172,21 +1605,42 @@ async def get_injection_script():
     
     async function handleFiles(files) {
         if (!files || files.length === 0) return;
-        showProgress('Uploading files...', 5, '');
-        
-        var formData = new FormData();
-        for (var i = 0; i < files.length; i++) {
-            formData.append('files', files[i]);
+        var pdfs = Array.from(files).filter(function(f) { return f.name.toLowerCase().endsWith('.pdf'); });
+        if (pdfs.length === 0) {
+            showNotification('Please choose PDF files', 'error');
+            return;
         }
+        showProgress('Uploading files...', 0, '');
         
         try {
-            var response = await fetchWithAuth(API_PREFIX + '/pdf-upload', {
-                method: 'POST',
-                body: formData
-            });
+            // Clear the previous run, then send each PDF as its own streamed
+            // request body (a few at a time) instead of one giant multipart form
+            var reset = await fetchWithAuth(API_PREFIX + '/pdf-reset', { method: 'DELETE' });
+            if (!reset.ok) throw new Error('Could not clear the previous run');
+            
+            var next = 0;
+            var done = 0;
+            async function uploadWorker() {
+                while (next < pdfs.length) {
+                    var file = pdfs[next++];
+                    var res = await fetchWithAuth(API_PREFIX + '/pdf-upload-one', {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/pdf',
+                            'X-Filename': encodeURIComponent(file.name)
+                        },
+                        body: file
+                    });
+                    if (!res.ok) throw new Error('Upload failed for ' + file.name);
+                    done++;
+                    showProgress('Uploading files...', Math.round(done / pdfs.length * 5), done + ' of ' + pdfs.length + ' uploaded');
+                }
+            }
+            await Promise.all([uploadWorker(), uploadWorker(), uploadWorker()]);
             
+            var response = await fetchWithAuth(API_PREFIX + '/pdf-crawl', { method: 'POST' });
             var data = await response.json();
-            console.log('[PDF Crawler] Upload response:', data);
+            console.log('[PDF Crawler] Crawl response:', data);
             
             if (!response.ok) throw new Error(data.detail || 'Upload failed');
             startPolling();
@@ -1199,31 +1653,58 @@ async def get_injection_script():
     
     function startPolling() {
         showProgress('Starting crawler...', 10, 'Please wait, this may take a few minutes...');
+        watchJob().catch(function(error) {
+            if (error.name === 'AbortError') return;
+            console.error('[PDF Crawler] Job events error:', error);
+            showNotification('Lost track of the crawler: ' + error.message, 'error');
+            showUploadStep();
+        });
+    }
+    
+    // Follow the job over server-sent events (read via fetch so the auth
+    // header is sent) and react as soon as its status changes
+    async function watchJob() {
+        jobEvents = new AbortController();
+        var response = await fetchWithAuth(API_PREFIX + '/pdf-job-events', { signal: jobEvents.signal });
+        if (!response.ok) throw new Error('Job events unavailable');
         
-        pollInterval = setInterval(async function() {
-            try {
-                var response = await fetchWithAuth(API_PREFIX + '/pdf-job-status');
-                var status = await response.json();
+        var reader = response.body.getReader();
+        var decoder = new TextDecoder();
+        var buffer = '';
+        while (true) {
+            var chunk = await reader.read();
+            if (chunk.done) break;
+            buffer += decoder.decode(chunk.value, { stream: true });
+            var events = buffer.split('\n\n');
+            buffer = events.pop();
+            for (var i = 0; i < events.length; i++) {
+                if (events[i].indexOf('data: ') !== 0) continue;
+                var status = JSON.parse(events[i].slice(6));
                 console.log('[PDF Crawler] Job status:', status);
-                
-                if (status.status === 'completed') {
-                    clearInterval(pollInterval);
-                    pollInterval = null;
-                    showProgress('Loading results...', 95, 'Generating thumbnails...');
-                    await loadPDFs();
-                    showReviewStep();
-                } else if (status.status === 'failed') {
-                    clearInterval(pollInterval);
-                    pollInterval = null;
-                    showNotification('Crawling failed: ' + status.message, 'error');
-                    showUploadStep();
-                } else {
-                    showProgress('Crawling PDFs...', status.progress || 30, status.message || 'Downloading linked PDFs...');
+                if (await handleJobStatus(status)) {
+                    jobEvents = null;
+                    return;
                 }
-            } catch (error) {
-                console.error('[PDF Crawler] Poll error:', error);
             }
-        }, 2000);
+        }
+        throw new Error('status stream ended early');
+    }
+    
+    // Returns true once the job has finished one way or the other
+    async function handleJobStatus(status) {
+        if (status.status === 'completed') {
+            showProgress('Loading results...', 95, 'Generating thumbnails...');
+            await loadPDFs();
+            showReviewStep();
+            return true;
+        }
+        if (status.status === 'failed') {
+            showNotification('Crawling failed: ' + status.message, 'error');
+            showUploadStep();
+            return true;
+        }
+        showProgress('Crawling PDFs...', status.progress || 30, status.message || 'Downloading linked PDFs...');
+        return false;
     }
     
     async function loadPDFs() {
@@ -1234,29 +1715,49 @@ async def get_injection_script():
         excludedPDFs = new Set(crawledPDFs.filter(function(p) { return p.excluded; }).map(function(p) { return p.name; }));
     }
     
-    async function togglePDF(name) {
+    // Toggles are applied to the UI at once and sent to the server in batches
+    var pendingToggles = new Map();
+    var flushTimer = null;
+    
+    function togglePDF(name) {
         var isExcluded = !excludedPDFs.has(name);
         if (isExcluded) excludedPDFs.add(name);
         else excludedPDFs.delete(name);
         
+        var item = document.querySelector('.pdf-item[data-name="' + CSS.escape(name) + '"]');
+        if (item) {
+            item.classList.toggle('excluded', isExcluded);
+            item.querySelector('.pdf-toggle').textContent = isExcluded ? '✓' : '❌';
+        }
+        var pdf = crawledPDFs.find(function(p) { return p.name === name; });
+        if (pdf) pdf.excluded = isExcluded;
+        updateFooter();
+        
+        pendingToggles.set(name, isExcluded);
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushToggles, 400);
+    }
+    
+    async function flushToggles() {
+        clearTimeout(flushTimer);
+        flushTimer = null;
+        if (pendingToggles.size === 0) return;
+        
+        var items = Array.from(pendingToggles, function(entry) {
+            return { name: entry[0], excluded: entry[1] };
+        });
+        pendingToggles.clear();
+        
         try {
-            await fetchWithAuth(API_PREFIX + '/pdf-toggle/' + encodeURIComponent(name), {
-                method: 'PATCH',
+            var response = await fetchWithAuth(API_PREFIX + '/pdf-toggle-bulk', {
+                method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ name: name, excluded: isExcluded })
+                body: JSON.stringify(items)
             });
-            var item = document.querySelector('.pdf-item[data-name="' + name + '"]');
-            if (item) {
-                item.classList.toggle('excluded', isExcluded);
-                item.querySelector('.pdf-toggle').textContent = isExcluded ? '✓' : '❌';
-            }
-            var pdf = crawledPDFs.find(function(p) { return p.name === name; });
-            if (pdf) pdf.excluded = isExcluded;
-            updateFooter();
+            if (!response.ok) throw new Error('Toggle failed');
         } catch (error) {
             console.error('[PDF Crawler] Toggle error:', error);
-            if (isExcluded) excludedPDFs.delete(name);
-            else excludedPDFs.add(name);
+            showNotification('Could not save selection: ' + error.message, 'error');
         }
     }
     
@@ -1265,6 +1766,9 @@ async def get_injection_script():
         showProgress(actionText, 50, '');
         
         try {
+            // Make sure the server has every exclusion before it picks files
+            await flushToggles();
+            
             var body = {};
             if (currentKnowledgeId) body.knowledge_id = currentKnowledgeId;
             
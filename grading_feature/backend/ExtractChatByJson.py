@@ -1,12 +1,21 @@
 import json
 import csv
 import os
-import glob
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+User = namedtuple('User', 'name email role')
+UNKNOWN = User('Unknown', '', '')
 
 def load_user_mapping(csv_path="users.csv"):
-    """Load user_id to user info mapping from users.csv"""
+    """Load user_id to User(name, email, role) mapping from users.csv"""
     user_map = {}
     # Get script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,14 +23,14 @@ def load_user_mapping(csv_path="users.csv"):
     
     try:
         with open(csv_full_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            header = next(reader, [])
+            id_i, name_i, email_i, role_i = [header.index(col) for col in ('id', 'name', 'email', 'role')]
             for row in reader:
-                uid = row['id'].strip('"')
-                user_map[uid] = {
-                    'name': row['name'],
-                    'email': row['email'],
-                    'role': row['role']
-                }
+                # Skip blank lines like DictReader did
+                if not row:
+                    continue
+                user_map[row[id_i].strip('"')] = User(row[name_i], row[email_i], row[role_i])
         print(f"✓ Loaded {len(user_map)} users")
     except FileNotFoundError:
         print(f"⚠ File not found: {csv_full_path}, will use user_id only")
@@ -29,18 +38,30 @@ def load_user_mapping(csv_path="users.csv"):
         print(f"⚠ Error reading users.csv: {e}")
     return user_map
 
+# Directories not worth descending into when looking for exports
+SKIP_DIRS = {'node_modules', 'venv', '__pycache__'}
+
+def _scan(path):
+    """Yield (path, size) for every .json file under path in a single scandir walk"""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                # Hidden entries (.git, .venv, ...) are skipped like glob does
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        yield from _scan(entry.path)
+                elif entry.is_file(follow_symlinks=False) and entry.name.endswith('.json'):
+                    yield entry.path, entry.stat().st_size
+    except OSError:
+        # Unreadable directory
+        return
+
 def select_json_files():
     """Search for JSON files in current directory and let user select"""
     current_dir = os.getcwd()
-    json_files = []
-    
-    # Search for .json files
-    for ext in ["*.json"]:
-        json_files.extend(glob.glob(os.path.join(current_dir, ext)))
-        json_files.extend(glob.glob(os.path.join(current_dir, "**", ext), recursive=True))
-    
-    # Remove duplicates and sort
-    json_files = sorted(set(json_files))
+    json_files = sorted(_scan(current_dir))
     
     if not json_files:
         print("No JSON files found in current directory and subdirectories.")
@@ -48,9 +69,9 @@ def select_json_files():
     
     print(f"\nFound the following JSON files in {current_dir}:")
     print("-" * 60)
-    for i, file in enumerate(json_files, 1):
+    for i, (file, size) in enumerate(json_files, 1):
         rel_path = os.path.relpath(file, current_dir)
-        file_size = os.path.getsize(file) / 1024  # KB
+        file_size = size / 1024  # KB
         print(f"{i:2d}. {rel_path} ({file_size:.1f} KB)")
     
     print("-" * 60)
@@ -62,7 +83,7 @@ def select_json_files():
             idx = int(user_input)
             
             if 1 <= idx <= len(json_files):
-                selected_file = json_files[idx - 1]
+                selected_file = json_files[idx - 1][0]
                 print(f"Selected: {os.path.relpath(selected_file, current_dir)}")
                 return selected_file
             else:
@@ -74,7 +95,64 @@ def select_json_files():
             print("\nOperation cancelled.")
             return None
 
-conversations = defaultdict(lambda: defaultdict(list))
+def iter_records(f):
+    """Yield the top-level list entries of an export, streaming them with ijson when available"""
+    if ijson is None:
+        data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError("JSON top-level is not a list")
+        yield from data
+        return
+    
+    # ijson yields nothing for a non-list top level, so check the first token up front
+    head = f.read(1)
+    while head.isspace():
+        head = f.read(1)
+    if head != b'[':
+        raise ValueError("JSON top-level is not a list")
+    f.seek(0)
+    try:
+        yield from ijson.items(f, 'item', use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(f"JSON parsing error: {e}") from e
+
+@lru_cache(maxsize=8192)
+def _fmt(ts_int):
+    """Format a unix timestamp as (date, time); messages in a conversation share most of these"""
+    dt = datetime.fromtimestamp(ts_int)
+    return dt.strftime('%Y-%m-%d'), dt.strftime('%H:%M:%S')
+
+def write_conversation(conv_file, user_info, uid, conv_id, conv_title, conv_messages):
+    """Write one conversation's transcript file"""
+    # Build the whole file body and write it once
+    parts = [
+        f"User: {user_info.name} ({user_info.email})\n",
+        f"User ID: {uid}\n",
+        f"Conversation Title: {conv_title}\n",
+        f"Conversation ID: {conv_id}\n",
+        f"Total Messages: {len(conv_messages)}\n",
+        "=" * 60 + "\n\n"
+    ]
+    
+    current_date = None
+    for msg in conv_messages:
+        # Add date separator when date changes
+        if msg['date'] != current_date:
+            current_date = msg['date']
+            parts.append(f"\n{'='*60}\nDate: {current_date}\n{'='*60}\n\n")
+        
+        parts.append(f"[{msg['time']}] [{msg['role']}]\n{msg['content']}\n\n")
+    
+    with open(conv_file, 'w', encoding='utf-8') as cf:
+        cf.write(''.join(parts))
+
+# Conversation files are independent, so they are written from a thread pool
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+MAX_PENDING_WRITES = WRITE_WORKERS * 4
+
+# Only per-conversation counts are kept; messages are written out as each record is parsed
+conversations = defaultdict(list)
+message_counts = defaultdict(int)
 
 try:
     # Get script directory
@@ -91,139 +169,116 @@ try:
     
     os.makedirs(output_dir, exist_ok=True)
     
-    with open(file_name, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Output complete CSV with user names and emails
+    csv_file = os.path.join(output_dir, "pure_chats.csv")
+    user_dirs = {}
+    pending = set()
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool, \
+            open(file_name, 'rb') as f, open(csv_file, 'w', newline='', encoding='utf-8') as csv_out:
+        writer = csv.writer(csv_out)
+        writer.writerow((
+            'user_id', 'user_name', 'user_email', 'user_role',
+            'conversation_id', 'conversation_title', 
+            'date', 'time', 'role', 'content'
+        ))
         
-        if isinstance(data, list):
-            for record in data:
-                uid = record.get('user_id', 'unknown')
-                conv_id = record.get('id', 'unknown_conversation')
-                conv_title = record.get('title', 'Untitled')
-                
-                messages_dict = record.get('chat', {}).get('history', {}).get('messages', {})
-                
-                # Collect all messages in this conversation
-                conv_messages = []
-                for msg_id, msg in messages_dict.items():
-                    role = msg.get('role')
-                    content = msg.get('content')
-                    timestamp = msg.get('timestamp', 0)
-                    
-                    if role in ('user', 'assistant') and content:
-                        conv_messages.append({
-                            'role': role,
-                            'content': content,
-                            'timestamp': timestamp,
-                            'date': datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d') if timestamp else 'unknown',
-                            'time': datetime.fromtimestamp(timestamp).strftime('%H:%M:%S') if timestamp else 'unknown',
-                            'conv_id': conv_id,
-                            'conv_title': conv_title
-                        })
-                
-                # Sort by timestamp
-                conv_messages.sort(key=lambda x: x['timestamp'])
-                
-                # Group by user and conversation
-                if conv_messages:
-                    conversations[uid][conv_id] = {
-                        'title': conv_title,
-                        'messages': conv_messages
-                    }
+        for record in iter_records(f):
+            uid = record.get('user_id', 'unknown')
+            conv_id = record.get('id', 'unknown_conversation')
+            conv_title = record.get('title', 'Untitled')
             
-            # Output summary with user names
-            summary_file = os.path.join(output_dir, "summary.txt")
-            with open(summary_file, 'w', encoding='utf-8') as sf:
-                sf.write("=== Chat Content Statistics ===\n\n")
-                sf.write(f"Total Users: {len(conversations)}\n\n")
+            messages_dict = record.get('chat', {}).get('history', {}).get('messages', {})
+            
+            # Collect all messages in this conversation
+            conv_messages = []
+            for msg_id, msg in messages_dict.items():
+                role = msg.get('role')
+                content = msg.get('content')
+                timestamp = msg.get('timestamp', 0)
                 
-                for uid, convs in sorted(conversations.items()):
-                    user_info = user_map.get(uid, {'name': 'Unknown', 'email': '', 'role': ''})
-                    total_msgs = sum(len(c['messages']) for c in convs.values())
-                    
-                    sf.write(f"User: {user_info['name']} ({user_info['email']})\n")
-                    sf.write(f"User ID: {uid}\n")
-                    sf.write(f"Role: {user_info['role']}\n")
-                    sf.write(f"  Conversations: {len(convs)}\n")
-                    sf.write(f"  Total Messages: {total_msgs}\n")
-                    for conv_id, conv_data in convs.items():
-                        sf.write(f"    [{conv_data['title']}]: {len(conv_data['messages'])} messages\n")
-                    sf.write("\n")
+                if role in ('user', 'assistant') and content:
+                    date, time_ = _fmt(int(timestamp)) if timestamp else ('unknown', 'unknown')
+                    conv_messages.append({
+                        'role': role,
+                        'content': content,
+                        'timestamp': timestamp,
+                        'date': date,
+                        'time': time_
+                    })
+            
+            if not conv_messages:
+                continue
             
-            # Output complete CSV with user names and emails
-            csv_file = os.path.join(output_dir, "pure_chats.csv")
-            with open(csv_file, 'w', newline='', encoding='utf-8') as cf:
-                writer = csv.DictWriter(cf, fieldnames=[
-                    'user_id', 'user_name', 'user_email', 'user_role',
-                    'conversation_id', 'conversation_title', 
-                    'date', 'time', 'role', 'content'
-                ])
-                writer.writeheader()
-                for uid, convs in conversations.items():
-                    user_info = user_map.get(uid, {'name': 'Unknown', 'email': '', 'role': ''})
-                    for conv_id, conv_data in convs.items():
-                        for msg in conv_data['messages']:
-                            writer.writerow({
-                                'user_id': uid,
-                                'user_name': user_info['name'],
-                                'user_email': user_info['email'],
-                                'user_role': user_info['role'],
-                                'conversation_id': conv_id,
-                                'conversation_title': conv_data['title'],
-                                'date': msg['date'],
-                                'time': msg['time'],
-                                'role': msg['role'],
-                                'content': msg['content']
-                            })
+            # Sort by timestamp
+            conv_messages.sort(key=lambda x: x['timestamp'])
             
-            # Output separate files for each user's conversations
-            for uid, convs in conversations.items():
-                user_info = user_map.get(uid, {'name': 'Unknown', 'email': '', 'role': ''})
+            conversations[uid].append((conv_title, len(conv_messages)))
+            message_counts[uid] += len(conv_messages)
+            
+            user_info = user_map.get(uid, UNKNOWN)
+            row_prefix = (uid, user_info.name, user_info.email, user_info.role, conv_id, conv_title)
+            writer.writerows(
+                row_prefix + (msg['date'], msg['time'], msg['role'], msg['content'])
+                for msg in conv_messages
+            )
+            
+            # Output a separate file for this conversation
+            user_dir = user_dirs.get(uid)
+            if user_dir is None:
                 # Folder name uses only user name (clean illegal characters)
-                safe_user_name = "".join(c for c in user_info['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
+                safe_user_name = "".join(c for c in user_info.name if c.isalnum() or c in (' ', '-', '_')).strip()
                 user_dir = os.path.join(output_dir, safe_user_name)
+                # Created here, once, so pool workers never race on makedirs
                 os.makedirs(user_dir, exist_ok=True)
-                
-                for conv_id, conv_data in convs.items():
-                    # Clean illegal characters from filename
-                    safe_title = "".join(c for c in conv_data['title'] if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
-                    conv_file = os.path.join(user_dir, f"{safe_title}_{conv_id[:8]}.txt")
-                    
-                    with open(conv_file, 'w', encoding='utf-8') as cf:
-                        cf.write(f"User: {user_info['name']} ({user_info['email']})\n")
-                        cf.write(f"User ID: {uid}\n")
-                        cf.write(f"Conversation Title: {conv_data['title']}\n")
-                        cf.write(f"Conversation ID: {conv_id}\n")
-                        cf.write(f"Total Messages: {len(conv_data['messages'])}\n")
-                        cf.write("=" * 60 + "\n\n")
-                        
-                        current_date = None
-                        for msg in conv_data['messages']:
-                            # Add date separator when date changes
-                            if msg['date'] != current_date:
-                                current_date = msg['date']
-                                cf.write(f"\n{'='*60}\n")
-                                cf.write(f"Date: {current_date}\n")
-                                cf.write(f"{'='*60}\n\n")
-                            
-                            cf.write(f"[{msg['time']}] [{msg['role']}]\n")
-                            cf.write(f"{msg['content']}\n\n")
+                user_dirs[uid] = user_dir
+            
+            # Clean illegal characters from filename
+            safe_title = "".join(c for c in conv_title if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
+            conv_file = os.path.join(user_dir, f"{safe_title}_{conv_id[:8]}.txt")
             
-            print(f"\n✓ Analysis complete!")
-            print(f"✓ Output directory: {os.path.abspath(output_dir)}")
-            print(f"✓ Total users: {len(conversations)}")
-            print(f"\nGrouped by user and conversation:")
-            for uid, convs in sorted(conversations.items()):
-                user_info = user_map.get(uid, {'name': 'Unknown', 'email': ''})
-                total = sum(len(c['messages']) for c in convs.values())
-                print(f"  {user_info['name']}: {len(convs)} conversations, {total} messages")
+            pending.add(pool.submit(write_conversation, conv_file, user_info, uid, conv_id, conv_title, conv_messages))
+            # Bound the queued writes so parsing can't race ahead and hold every conversation in memory
+            if len(pending) >= MAX_PENDING_WRITES:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+        
+        # Surface any write errors
+        for future in pending:
+            future.result()
+    
+    # Output summary with user names
+    summary_file = os.path.join(output_dir, "summary.txt")
+    with open(summary_file, 'w', encoding='utf-8') as sf:
+        sf.write("=== Chat Content Statistics ===\n\n")
+        sf.write(f"Total Users: {len(conversations)}\n\n")
+        
+        for uid, convs in sorted(conversations.items()):
+            user_info = user_map.get(uid, UNKNOWN)
             
-        else:
-            print("Error: JSON top-level is not a list")
+            sf.write(f"User: {user_info.name} ({user_info.email})\n")
+            sf.write(f"User ID: {uid}\n")
+            sf.write(f"Role: {user_info.role}\n")
+            sf.write(f"  Conversations: {len(convs)}\n")
+            sf.write(f"  Total Messages: {message_counts[uid]}\n")
+            for conv_title, msg_count in convs:
+                sf.write(f"    [{conv_title}]: {msg_count} messages\n")
+            sf.write("\n")
+    
+    print(f"\n✓ Analysis complete!")
+    print(f"✓ Output directory: {os.path.abspath(output_dir)}")
+    print(f"✓ Total users: {len(conversations)}")
+    print(f"\nGrouped by user and conversation:")
+    for uid, convs in sorted(conversations.items()):
+        user_info = user_map.get(uid, UNKNOWN)
+        print(f"  {user_info.name}: {len(convs)} conversations, {message_counts[uid]} messages")
 
 except FileNotFoundError:
     print(f"Error: File not found: {file_name}")
 except json.JSONDecodeError as e:
     print(f"Error: JSON parsing error: {e}")
+except ValueError as e:
+    print(f"Error: {e}")
 except Exception as e:
     print(f"An error occurred: {e}")
     import traceback
@@ -1,16 +1,22 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from pathlib import Path
-import json, shutil
-import subprocess
+import shutil
+import orjson
+import asyncio
+import re
 import sys
 import os
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import anyio.to_thread
 from openwebui_uploader import OpenWebUIUploader
+from thumbnails import THUMBNAIL_EXT, init_worker, render_thumbs_worker
 import uvicorn
 from dotenv import load_dotenv
 import socket
@@ -19,7 +25,8 @@ import socket
 load_dotenv() 
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# LOG_LEVEL=WARNING quiets the per-request summaries in production
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 
 # configs
 IS_DOCKER = os.environ.get('HOSTNAME', '').startswith('pdf-upload') or os.environ.get('DOCKER_CONTAINER', '') == 'true'
@@ -40,53 +47,11 @@ uploader = OpenWebUIUploader(
     kb_id=OPENWEBUI_KB_ID
 )
 
-def generate_thumbnail(pdf_path: Path, thumbnail_dir: Path) -> Optional[Path]:
-    """Generate a thumbnail for a PDF file"""
-    try:
-        from pdf2image import convert_from_path
-        
-        thumbnail_dir.mkdir(parents=True, exist_ok=True)
-        output_path = thumbnail_dir / f"{pdf_path.stem}.png"
-        
-        # Check if thumbnail already exists
-        if output_path.exists():
-            logging.info(f"Thumbnail already exists: {output_path}")
-            return output_path
-        
-        logging.info(f"Generating thumbnail for: {pdf_path}")
-        
-        # Convert first page to image with specific DPI for better quality
-        pages = convert_from_path(
-            str(pdf_path), 
-            first_page=1, 
-            last_page=1, 
-            dpi=100,  # Higher DPI for better quality
-            fmt='png'
-        )
-        
-        if pages and len(pages) > 0:
-            # Resize to thumbnail size
-            from PIL import Image
-            img = pages[0]
-            # Calculate size maintaining aspect ratio
-            max_width, max_height = 200, 250
-            img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-            img.save(output_path, "PNG", optimize=True)
-            
-            logging.info(f"Successfully created thumbnail: {output_path}")
-            return output_path
-        else:
-            logging.error(f"No pages found in PDF: {pdf_path}")
-            return None
-            
-    except ImportError as e:
-        logging.error(f"pdf2image not installed: {e}")
-        logging.error("Install with: pip install pdf2image pillow")
-        logging.error("On Mac, also run: brew install poppler")
-        return None
-    except Exception as e:
-        logging.error(f"Failed to create thumbnail for {pdf_path.name}: {e}")
-        return None
+# Thumbnail rendering is CPU-bound, so spread it across processes; each worker
+# loads PyMuPDF once and then renders whole batches. Capped so a large host
+# doesn't fork dozens of idle renderers for a handful of PDFs.
+_THUMB_WORKERS = min(8, os.cpu_count() or 4)
+_THUMB_POOL = ProcessPoolExecutor(max_workers=_THUMB_WORKERS, initializer=init_worker)
 
 DATA_DIR = Path("Webscraping/openwebui/data")
 SCRAPED = DATA_DIR / "webscraped"
@@ -99,6 +64,16 @@ INPUT_DIR = Path(__file__).parent / "Webscraping" / "input_files"
 for dir_path in [DATA_DIR, SCRAPED, KB, THUMBNAILS, INPUT_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
+def clear_dir(directory: Path, suffix: str) -> int:
+    """Delete every file ending in suffix from directory in a single scandir pass"""
+    removed = 0
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(suffix) and entry.is_file():
+                os.unlink(entry.path)
+                removed += 1
+    return removed
+
 def cleanup_on_startup():
     """Clean up old temporary files on startup"""
     logging.info("=== Cleaning up on startup ===")
@@ -108,20 +83,11 @@ def cleanup_on_startup():
         STATE_FILE.unlink()
         logging.info("Cleared old state file")
     
-    # Clear any PDFs in webscraped (these are temporary)
-    for pdf in SCRAPED.glob("*.pdf"):
-        pdf.unlink()
-        logging.info(f"Cleared old PDF: {pdf.name}")
-    
-    # Clear old thumbnails
-    for thumb in THUMBNAILS.glob("*.png"):
-        thumb.unlink()
-        logging.info(f"Cleared old thumbnail: {thumb.name}")
-    
-    # Clear input files
-    for pdf in INPUT_DIR.glob("*.pdf"):
-        pdf.unlink()
-        logging.info(f"Cleared old input: {pdf.name}")
+    # Clear temporary PDFs, thumbnails and inputs; one scandir pass per folder
+    scraped = clear_dir(SCRAPED, ".pdf")
+    thumbs = clear_dir(THUMBNAILS, THUMBNAIL_EXT)
+    inputs = clear_dir(INPUT_DIR, ".pdf")
+    logging.info(f"Cleared {scraped} old PDFs, {thumbs} thumbnails, {inputs} inputs")
     
     logging.info("Startup cleanup complete")
 
@@ -130,7 +96,8 @@ for dir_path in [DATA_DIR, SCRAPED, KB, THUMBNAILS, INPUT_DIR]:
 
 cleanup_on_startup()
 
-app = FastAPI(title="PDF Review Backend")
+# orjson-encoded JSON for every endpoint (orjson is already used for the state file)
+app = FastAPI(title="PDF Review Backend", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -154,8 +121,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount thumbnails directory as static files
-app.mount("/thumbnails", StaticFiles(directory=str(THUMBNAILS)), name="thumbnails")
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache responses for an hour"""
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        # Not immutable: a later crawl can produce a new PDF with the same name
+        response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
+
+# Thumbnails are served straight from disk by StaticFiles (sendfile, ETag, 304s)
+app.mount("/thumbnails", CachedStaticFiles(directory=str(THUMBNAILS), html=False, check_dir=True), name="thumbnails")
 
 class PDFItem(BaseModel):
     name: str
@@ -165,28 +140,70 @@ class CrawlRequest(BaseModel):
     pdf_paths: List[str]
     depth: int = 3
 
+# (st_mtime_ns, parsed state) of the last state file read or written
+_state_cache: Optional[tuple] = None
+# Name -> entry index over the cached state, so lookups don't scan the list
+_state_by_name: Dict[str, dict] = {}
+
+def _cache_state(mtime_ns, state):
+    """Remember a parsed state and rebuild its name index"""
+    global _state_cache, _state_by_name
+    _state_cache = (mtime_ns, state)
+    _state_by_name = {item["name"]: item for item in state}
+
 def load_state():
-    """Load state from file"""
-    if STATE_FILE.exists():
-        try:
-            saved_state = json.loads(STATE_FILE.read_text())
-            return saved_state
-        except Exception as e:
-            logging.error(f"Error loading state: {e}")
-            return []
-    return []
+    """Load state from file, reusing the parsed copy while the file is unchanged"""
+    try:
+        mtime_ns = STATE_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        _cache_state(None, [])
+        return _state_cache[1]
+    
+    if _state_cache and _state_cache[0] == mtime_ns:
+        return _state_cache[1]
+    
+    try:
+        saved_state = orjson.loads(STATE_FILE.read_bytes())
+    except Exception as e:
+        logging.error(f"Error loading state: {e}")
+        _cache_state(None, [])
+        return _state_cache[1]
+    _cache_state(mtime_ns, saved_state)
+    return saved_state
 
 def save_state(data):
-    STATE_FILE.write_text(json.dumps(data, indent=2))
+    # orjson emits compact bytes directly; the state file is machine-read only.
+    # Write a sibling temp file and rename it over the state file so a crash
+    # mid-write never leaves a truncated state behind.
+    tmp_file = STATE_FILE.with_suffix(".json.tmp")
+    tmp_file.write_bytes(orjson.dumps(data))
+    os.replace(tmp_file, STATE_FILE)
+    _cache_state(STATE_FILE.stat().st_mtime_ns, data)
 
-@app.get("/api/pdfs")
-def list_pdfs():
-    """List all PDFs in the webscraped directory"""
-    # Get all PDFs currently in the scraped folder
-    pdf_files = list(SCRAPED.glob("*.pdf"))
-    logging.info(f"Found {len(pdf_files)} PDFs in {SCRAPED}")
-    
-    if not pdf_files:
+# Thumbnail file names, read from disk once and then kept current by list_pdfs;
+# None forces a re-read after the thumbnails folder is cleared
+_thumb_names: Optional[set] = None
+
+def _scan_pdfs():
+    """Read the scraped PDFs (with cached stat results) and existing thumbnail names"""
+    global _thumb_names
+    # Get all PDFs currently in the scraped folder; DirEntry caches the stat result
+    with os.scandir(SCRAPED) as it:
+        entries = [(e.name, e.stat()) for e in it if e.name.endswith(".pdf") and e.is_file()]
+    logging.debug(f"Found {len(entries)} PDFs in {SCRAPED}")
+    
+    # One directory read instead of an exists() call per thumbnail
+    if _thumb_names is None:
+        _thumb_names = set(os.listdir(THUMBNAILS))
+    return entries, _thumb_names
+
+# (name, st_mtime_ns, st_ino) -> static part of a PDF's listing entry; the inode
+# catches a PDF replaced by a new file that happens to share the old mtime
+_file_info_cache: Dict[tuple, dict] = {}
+
+def _build_pdf_list(entries, existing_thumbs):
+    """Build the frontend listing and reconcile the saved state with it"""
+    if not entries:
         logging.warning(f"No PDFs found in {SCRAPED}")
         # Clear the state file if no PDFs exist
         if STATE_FILE.exists():
@@ -202,89 +219,170 @@ def list_pdfs():
     files = []
     existing_pdf_names = set()
     
-    for pdf in pdf_files:
-        existing_pdf_names.add(pdf.name)
-        logging.info(f"Processing PDF: {pdf.name}")
+    for name, st in entries:
+        existing_pdf_names.add(name)
+        logging.debug("Processing PDF: %s", name)
         
-        # Generate or check for thumbnail
-        thumb_path = THUMBNAILS / f"{pdf.stem}.png"
+        # Thumbnails were generated beforehand; missing ones failed to render
+        thumb_name = f"{os.path.splitext(name)[0]}{THUMBNAIL_EXT}"
         
-        # Try to generate thumbnail if it doesn't exist
-        if not thumb_path.exists():
-            logging.info(f"Thumbnail missing, generating for: {pdf.name}")
-            generated_thumb = generate_thumbnail(pdf, THUMBNAILS)
-            if generated_thumb and generated_thumb.exists():
-                thumb_path = generated_thumb
-            else:
-                logging.warning(f"Failed to generate thumbnail for {pdf.name}")
-                thumb_path = None
-        else:
-            logging.info(f"Thumbnail exists: {thumb_path}")
+        # Reuse the static fields while the file is unchanged
+        key = (name, st.st_mtime_ns, st.st_ino)
+        static_info = _file_info_cache.get(key)
+        if static_info is None:
+            static_info = {"name": name, "size_kb": round(st.st_size / 1024, 1)}
+            _file_info_cache[key] = static_info
         
         # Build the file info
         file_info = {
-            "name": pdf.name,
-            "size_kb": round(pdf.stat().st_size / 1024, 1),
-            "preview_url": f"/thumbnails/{thumb_path.name}" if thumb_path and thumb_path.exists() else None,
-            "excluded": old_exclusions.get(pdf.name, False)  # Preserve exclusion status if it existed
+            **static_info,
+            "preview_url": f"/thumbnails/{thumb_name}" if thumb_name in existing_thumbs else None,
+            "excluded": old_exclusions.get(name, False)  # Preserve exclusion status if it existed
         }
         
         files.append(file_info)
-        logging.info(f"Added file: {file_info['name']} (excluded: {file_info['excluded']})")
+        logging.debug("Added file: %s (excluded: %s)", file_info["name"], file_info["excluded"])
+    
+    # Drop cached info for PDFs that are gone or have been rewritten
+    current_keys = {(name, st.st_mtime_ns, st.st_ino) for name, st in entries}
+    for key in _file_info_cache.keys() - current_keys:
+        del _file_info_cache[key]
     
     # Create new state with only PDFs that actually exist
     new_state = [{"name": f["name"], "excluded": f["excluded"]} for f in files]
     
-    # Save the cleaned state
-    save_state(new_state)
-    logging.info(f"Saved state for {len(new_state)} PDFs")
+    # Save the cleaned state, skipping the write when nothing changed
+    if new_state != saved_state:
+        save_state(new_state)
+        logging.debug(f"Saved state for {len(new_state)} PDFs")
     
-    # Log what we're returning
-    logging.info(f"Returning {len(files)} PDFs to frontend")
-    for f in files:
-        logging.info(f"  - {f['name']} (excluded: {f['excluded']})")
+    # Per-PDF detail only at DEBUG; list_pdfs logs the summary
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        for f in files:
+            logging.debug("  - %s (excluded: %s)", f["name"], f["excluded"])
     
     return files
 
-@app.get("/thumbnails/{filename}")
-async def get_thumbnail(filename: str):
-    """Serve thumbnail images"""
-    file_path = THUMBNAILS / filename
-    logging.info(f"Thumbnail requested: {filename}")
-    
-    if file_path.exists() and file_path.is_file():
-        logging.info(f"Serving thumbnail: {file_path}")
-        return FileResponse(
-            file_path, 
-            media_type="image/png",
-            headers={"Cache-Control": "public, max-age=3600"}
-        )
+# PDF name -> future for a thumbnail render that a request has already started
+_thumb_inflight: Dict[str, asyncio.Future] = {}
+
+async def _render_thumbnails(names):
+    """Render thumbnails for the named PDFs, joining renders already in flight from concurrent polls"""
+    loop = asyncio.get_running_loop()
+    new = [name for name in names if name not in _thumb_inflight]
+    for name in new:
+        _thumb_inflight[name] = loop.create_future()
+    futures = {name: _thumb_inflight[name] for name in names}
     
-    logging.warning(f"Thumbnail not found: {file_path}")
-    raise HTTPException(status_code=404, detail="Thumbnail not found")
+    try:
+        if new:
+            logging.debug(f"Generating {len(new)} missing thumbnails")
+            # One batch per worker instead of one task per PDF
+            batches = [new[i::_THUMB_WORKERS] for i in range(min(_THUMB_WORKERS, len(new)))]
+            results = await asyncio.gather(*(
+                asyncio.wrap_future(_THUMB_POOL.submit(
+                    render_thumbs_worker, ([str(SCRAPED / name) for name in batch], str(THUMBNAILS))
+                ))
+                for batch in batches
+            ))
+            for batch, batch_result in zip(batches, results):
+                for name, thumb in zip(batch, batch_result):
+                    futures[name].set_result(thumb)
+    finally:
+        # Never leave other requests waiting on a render that failed or was cancelled
+        for name in new:
+            _thumb_inflight.pop(name)
+            if not futures[name].done():
+                futures[name].set_result(None)
+    
+    return {name: await futures[name] for name in names}
+
+# Last /api/pdfs response and the directory/state mtimes it was built from
+_pdfs_cache = {"key": None, "value": None}
+
+def _pdfs_cache_key():
+    """mtimes that change whenever a PDF, thumbnail or the state file is added or removed"""
+    try:
+        state_mtime = STATE_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        state_mtime = 0
+    return (SCRAPED.stat().st_mtime_ns, THUMBNAILS.stat().st_mtime_ns, state_mtime)
+
+@app.get("/api/pdfs")
+async def list_pdfs():
+    """List all PDFs in the webscraped directory"""
+    # Polling with nothing changed on disk returns the previous listing. The key
+    # is taken before anything is read, so a toggle that lands mid-listing can't
+    # end up cached under its own, newer mtime
+    cache_key = _pdfs_cache_key()
+    if _pdfs_cache["key"] is not None and _pdfs_cache["key"] == cache_key:
+        return _pdfs_cache["value"]
+    
+    # Disk work runs in a worker thread so the event loop stays free
+    entries, existing_thumbs = await anyio.to_thread.run_sync(_scan_pdfs)
+    
+    # Render all missing thumbnails in parallel; await the pool without holding a thread.
+    # New names are added to existing_thumbs, which is the shared _thumb_names set
+    missing = [name for name, _ in entries if f"{os.path.splitext(name)[0]}{THUMBNAIL_EXT}" not in existing_thumbs]
+    new_thumbs = 0
+    if missing:
+        generated = await _render_thumbnails(missing)
+        for name in missing:
+            thumb = generated[name]
+            if thumb:
+                existing_thumbs.add(Path(thumb).name)
+                new_thumbs += 1
+            else:
+                logging.warning(f"Failed to generate thumbnail for {name}")
+    
+    files = await anyio.to_thread.run_sync(_build_pdf_list, entries, existing_thumbs)
+    excluded_count = sum(1 for f in files if f["excluded"])
+    logging.info(f"list_pdfs: {len(files)} PDFs, {new_thumbs} new thumbnails, {excluded_count} excluded")
+    # Only cache a listing nothing changed under. After this call's own thumbnail
+    # or state writes the next poll rebuilds once, finds nothing to write and is cached
+    if _pdfs_cache_key() == cache_key:
+        _pdfs_cache["key"], _pdfs_cache["value"] = cache_key, files
+    return files
 
 @app.patch("/api/pdfs/{name}")
 def toggle_exclusion(name: str, item: PDFItem):
     """Toggle PDF exclusion status"""
     state = load_state()
-    found = False
-    
-    for pdf in state:
-        if pdf["name"] == name:
-            pdf["excluded"] = item.excluded
-            found = True
-            break
     
-    # If not found in state, add it
-    if not found:
+    # load_state keeps _state_by_name pointing at the entries of this list
+    entry = _state_by_name.get(name)
+    if entry:
+        # Repeated clicks with the same value don't need a disk write
+        if entry["excluded"] != item.excluded:
+            entry["excluded"] = item.excluded
+            save_state(state)
+            _pdfs_cache["key"] = None
+    else:
+        # If not found in state, add it
         state.append({"name": name, "excluded": item.excluded})
-    
-    save_state(state)
+        save_state(state)
+        _pdfs_cache["key"] = None
     logging.info(f"{'Excluded' if item.excluded else 'Included'}: {name}")
     return {"message": f"{'Excluded' if item.excluded else 'Included'} {name}"}
+def _save_upload(src, dest: Path):
+    """Stream an uploaded file object to dest with bounded memory"""
+    with open(dest, "wb") as f:
+        shutil.copyfileobj(src, f, 1 << 20)
+
+# link_downloader's log line for each PDF it has finished writing
+_CRAWLER_SAVED_RE = re.compile(
+    r"(?:Successfully downloaded and saved|Downloaded from Drive via Playwright|Rendered page to PDF): (.+\.pdf)\s*$"
+)
+
+# Longest a finished crawl waits for its outstanding thumbnail renders (seconds)
+_THUMBNAIL_WAIT_TIMEOUT = 120
+
 @app.post("/api/upload")
 async def upload_and_crawl(files: List[UploadFile] = File(...)):
     """Upload PDFs and trigger web crawling"""
+    global _thumb_names
+    _pdfs_cache["key"] = None
+    _thumb_names = None
     
     # CLEAR ALL OLD DATA FROM PREVIOUS RUNS
     logging.info("=== Clearing old data from previous runs ===")
@@ -294,25 +392,12 @@ async def upload_and_crawl(files: List[UploadFile] = File(...)):
         STATE_FILE.unlink()
         logging.info("Cleared state file")
     
-    # 2. Clear ALL PDFs from webscraped folder (old crawled files)
-    for old_pdf in SCRAPED.glob("*.pdf"):
-        old_pdf.unlink()
-        logging.info(f"Deleted old PDF from webscraped: {old_pdf.name}")
-    
-    # 3. Clear ALL thumbnails from previous runs
-    for old_thumb in THUMBNAILS.glob("*.png"):
-        old_thumb.unlink()
-        logging.info(f"Deleted old thumbnail: {old_thumb.name}")
-    
-    # 4. Clear knowledge base folder (in case files weren't finalized)
-    for old_kb_pdf in KB.glob("*.pdf"):
-        old_kb_pdf.unlink()
-        logging.info(f"Deleted old PDF from KB: {old_kb_pdf.name}")
-    
-    # 5. Clear input directory
-    for old_file in INPUT_DIR.glob("*.pdf"):
-        old_file.unlink()
-        logging.info(f"Deleted old input file: {old_file.name}")
+    # 2-5. Clear crawled PDFs, thumbnails, unfinalized KB PDFs and inputs
+    scraped = clear_dir(SCRAPED, ".pdf")
+    thumbs = clear_dir(THUMBNAILS, THUMBNAIL_EXT)
+    kb = clear_dir(KB, ".pdf")
+    inputs = clear_dir(INPUT_DIR, ".pdf")
+    logging.info(f"Deleted {scraped} crawled PDFs, {thumbs} thumbnails, {kb} KB PDFs, {inputs} inputs")
     
     logging.info("=== Old data cleared, starting fresh upload ===")
     
@@ -321,14 +406,15 @@ async def upload_and_crawl(files: List[UploadFile] = File(...)):
     for file in files:
         if file.filename.endswith('.pdf'):
             file_path = INPUT_DIR / file.filename
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
+            # Copy the spooled upload to disk in 1 MiB chunks within one worker
+            # thread, rather than a thread hop per chunk read and write
+            await anyio.to_thread.run_sync(_save_upload, file.file, file_path)
             saved_files.append(str(file_path))
-            logging.info(f"Saved uploaded file: {file_path}")
+            logging.debug("Saved uploaded file: %s", file_path)
     
     if not saved_files:
         raise HTTPException(400, "No PDF files uploaded")
+    logging.info("Saved %d uploaded PDFs", len(saved_files))
     
     # Run the link_downloader script
     script_path = Path(__file__).parent / "Webscraping" / "link_downloader.py"
@@ -352,20 +438,61 @@ async def upload_and_crawl(files: List[UploadFile] = File(...)):
     logging.info(f"Output directory: {SCRAPED.absolute()}")
     
     try:
-        # Run the crawler with a timeout
-        result = subprocess.run(
-            cmd, 
-            capture_output=True, 
-            text=True,
-            cwd=str(Path(__file__).parent),
-            timeout=60 
+        # Run the crawler without blocking the event loop. Its stdout is never
+        # read, so it goes straight to our own stdout at DEBUG and is discarded
+        # otherwise; only stderr (its log) is read
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=None if logging.getLogger().isEnabledFor(logging.DEBUG) else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(Path(__file__).parent)
         )
+        # Follow the crawler's log as it runs and start each PDF's thumbnail as
+        # soon as it is reported saved, so rendering overlaps the rest of the crawl
+        stderr_tail = deque(maxlen=20)
+        thumb_tasks = []
+        
+        async def follow_crawler():
+            async for raw in proc.stderr:
+                line = raw.decode(errors="replace").rstrip()
+                stderr_tail.append(line)
+                match = _CRAWLER_SAVED_RE.search(line)
+                if match:
+                    name = os.path.basename(match.group(1))
+                    thumb_tasks.append(asyncio.ensure_future(_render_thumbnails([name])))
+            await proc.wait()
+        
+        try:
+            await asyncio.wait_for(follow_crawler(), timeout=60)
+        finally:
+            # Kill the subprocess if it's still running, whether we timed out or
+            # following its log failed (e.g. a stderr line over the reader's limit)
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
         
-        logging.info(f"Crawler completed successfully")
+        if proc.returncode == 0:
+            logging.info("Crawler completed successfully")
+        else:
+            logging.error("Crawler exited with code %d:\n%s", proc.returncode, "\n".join(stderr_tail))
+        
+        # The review page's first listing then finds every thumbnail already on disk
+        # Bounded, so one stuck render can't hang the request
+        if thumb_tasks:
+            done, pending = await asyncio.wait(thumb_tasks, timeout=_THUMBNAIL_WAIT_TIMEOUT)
+            rendered = 0
+            for task in done:
+                if task.exception() is None:
+                    rendered += sum(1 for thumb in task.result().values() if thumb is not None)
+            logging.info(f"Rendered {rendered} of {len(thumb_tasks)} thumbnails during the crawl")
+            if pending:
+                # /api/pdfs renders whatever is still missing on demand
+                logging.warning(f"{len(pending)} thumbnail renders still running after {_THUMBNAIL_WAIT_TIMEOUT}s")
+                for task in pending:
+                    task.cancel()
         
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         logging.error("Crawler timed out after 60 seconds")
-        # Kill the subprocess if it's still running
         
         # Check what files were created even though it timed out
         pdf_count = len(list(SCRAPED.glob("*.pdf")))
@@ -386,48 +513,86 @@ async def upload_and_crawl(files: List[UploadFile] = File(...)):
             "pdfs_found": 0
         }
 
+def _move_to_kb(name: str) -> Optional[Path]:
+    """Move a scraped PDF into the local KB folder, returning its new path"""
+    source = SCRAPED / name
+    if not source.exists():
+        return None
+    # A single rename when both live on the same filesystem, falling back to
+    # copy+delete across devices (e.g. the GCS mount)
+    dest = KB / name
+    try:
+        os.rename(source, dest)
+    except OSError:
+        shutil.move(str(source), str(dest))
+    logging.debug("Moved to KB: %s", name)
+    return dest
+
+# How many PDFs are moved and uploaded to OpenWebUI at the same time
+_FINALIZE_CONCURRENCY = 4
+
 @app.post("/api/finalize")
-def finalize_upload():
+async def finalize_upload():
     """Move non-excluded PDFs to knowledge base and upload to OpenWebUI"""
-    state = load_state()
+    _pdfs_cache["key"] = None
+    state = await anyio.to_thread.run_sync(load_state)
     
     # Only include PDFs that are not excluded
-    include = [pdf for pdf in state if not pdf["excluded"]]
+    include = [pdf["name"] for pdf in state if not pdf["excluded"]]
     KB.mkdir(parents=True, exist_ok=True)
     moved = []
     uploaded_to_openwebui = []
     upload_errors = []
     
-    for pdf_data in include:
-        source = SCRAPED / pdf_data["name"]
-        if source.exists():
-            # Move to local KB folder
-            dest = KB / pdf_data["name"]
-            shutil.copy2(str(source), str(dest))  # Use copy2 instead of move so we can upload it
-            moved.append(pdf_data["name"])
-            logging.info(f"Copied to KB: {pdf_data['name']}")
-            
-            # Upload to OpenWebUI
+    semaphore = asyncio.Semaphore(_FINALIZE_CONCURRENCY)
+    
+    async def move_and_upload(name):
+        """Returns (dest, file_id, error); dest is None if the PDF has vanished"""
+        async with semaphore:
+            dest = await anyio.to_thread.run_sync(_move_to_kb, name)
+            if dest is None:
+                return None, None, None
             try:
-                result = uploader.upload_and_add_to_kb(source)
-                uploaded_to_openwebui.append({
-                    "filename": pdf_data["name"],
-                    "file_id": result.get("file_id"),
-                    "status": "success"
-                })
-                logging.info(f"Uploaded to OpenWebUI: {pdf_data['name']}")
+                file_id = await anyio.to_thread.run_sync(uploader.upload_file, dest)
+                return dest, file_id, None
+            except Exception as e:
+                return dest, None, str(e)
+    
+    # Moves and file uploads are independent, so run them concurrently
+    outcomes = await asyncio.gather(*(move_and_upload(name) for name in include))
+    
+    # Knowledge-base adds stay sequential: the duplicate-merge fallback rewrites
+    # the KB's whole file list and would race with itself
+    for name, (dest, file_id, error_msg) in zip(include, outcomes):
+        if dest is None:
+            continue
+        moved.append(name)
+        if error_msg is None:
+            try:
+                await anyio.to_thread.run_sync(uploader.add_to_knowledge_base, file_id)
             except Exception as e:
                 error_msg = str(e)
-                upload_errors.append({
-                    "filename": pdf_data["name"],
-                    "error": error_msg
-                })
-                logging.error(f"Failed to upload {pdf_data['name']} to OpenWebUI: {error_msg}")
+        
+        if error_msg is None:
+            uploaded_to_openwebui.append({
+                "filename": name,
+                "file_id": file_id,
+                "status": "success"
+            })
+            logging.debug("Uploaded to OpenWebUI: %s", name)
+        else:
+            upload_errors.append({
+                "filename": name,
+                "error": error_msg
+            })
+            logging.error(f"Failed to upload {name} to OpenWebUI: {error_msg}")
     
-    # Clean up: remove all PDFs from scraped folder (both excluded and included)
-    for pdf in SCRAPED.glob("*.pdf"):
-        pdf.unlink()
-        logging.info(f"Cleaned up: {pdf.name}")
+    # Clean up: remove all PDFs left in the scraped folder (the excluded ones)
+    count = await anyio.to_thread.run_sync(clear_dir, SCRAPED, ".pdf")
+    logging.info(
+        f"finalize: {len(moved)} moved to KB, {len(uploaded_to_openwebui)} uploaded, "
+        f"{len(upload_errors)} failed, {count} left-over PDFs removed"
+    )
     
     # Clear the state after finalizing
     if STATE_FILE.exists():
@@ -446,9 +611,9 @@ def finalize_upload():
 def test_openwebui_connection():
     """Test connection to OpenWebUI"""
     try:
-        response = requests.get(
+        # Reuse the uploader's pooled session (it carries the auth header)
+        response = uploader.session.get(
             f"{OPENWEBUI_BASE_URL}/api/v1/knowledge/{OPENWEBUI_KB_ID}",
-            headers={"Authorization": f"Bearer {OPENWEBUI_API_KEY}"},
             timeout=10
         )
         
@@ -508,27 +673,19 @@ async def upload_to_openwebui(pdf_names: List[str]):
 @app.delete("/api/reset")
 def reset_state():
     """Reset the application state completely"""
+    global _thumb_names
+    _pdfs_cache["key"] = None
+    _thumb_names = None
     # Clear state file
     if STATE_FILE.exists():
         STATE_FILE.unlink()
-        logging.info("Deleted state file")
-    
-    # Clear thumbnails
-    for thumb in THUMBNAILS.glob("*.png"):
-        thumb.unlink()
-    logging.info(f"Cleared thumbnails")
-    
-    # Clear webscraped folder
-    for pdf in SCRAPED.glob("*.pdf"):
-        pdf.unlink()
-    logging.info(f"Cleared webscraped folder")
     
-    # Clear input files
-    for pdf in INPUT_DIR.glob("*.pdf"):
-        pdf.unlink()
-    logging.info(f"Cleared input files")
+    # Clear thumbnails, webscraped folder and input files
+    thumbs = clear_dir(THUMBNAILS, THUMBNAIL_EXT)
+    scraped = clear_dir(SCRAPED, ".pdf")
+    inputs = clear_dir(INPUT_DIR, ".pdf")
     
-    logging.info("Reset application state completely")
+    logging.info(f"reset: cleared {thumbs} thumbnails, {scraped} scraped PDFs, {inputs} input files")
     return {"message": "State reset successfully"}
 
 if __name__ == "__main__":
@@ -558,10 +715,10 @@ if __name__ == "__main__":
     
     # Check if required libraries are installed
     try:
-        import pdf2image
-        print("✓ pdf2image installed")
+        import fitz
+        print("✓ PyMuPDF installed")
     except ImportError:
-        print("✗ pdf2image NOT installed - run: pip install pdf2image")
+        print("✗ PyMuPDF NOT installed - run: pip install pymupdf")
     
     try:
         from PIL import Image
@@ -570,4 +727,16 @@ if __name__ == "__main__":
         print("✗ PIL/Pillow NOT installed - run: pip install Pillow")
     
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8437
-    uvicorn.run(app, host="0.0.0.0", port=port, reload=False)
\ No newline at end of file
+    # uvloop + httptools replace the pure-Python asyncio loop and h11 parser.
+    # Each worker runs the startup cleanup and keeps its own caches and thumbnail
+    # pool, so extra workers are opt-in via WEB_CONCURRENCY.
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "backend:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=port,
+        reload=False,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+    )
\ No newline at end of file
@@ -1,6 +1,8 @@
 import json
 import pathlib
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 import logging
 from typing import Optional, Dict, Any
 
@@ -10,6 +12,13 @@ class OpenWebUIUploader:
         self.api_key = api_key
         self.kb_id = kb_id
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        
+        # One pooled session so repeated calls reuse the TCP/TLS connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def upload_file(self, file_path: pathlib.Path, metadata: Optional[Dict[str, Any]] = None) -> str:
         """Upload a file to OpenWebUI and return its file_id"""
@@ -17,19 +26,18 @@ class OpenWebUIUploader:
             raise FileNotFoundError(f"File not found: {file_path}")
         
         url_upload = f"{self.base_url}/api/v1/files/"
-        data = {
-            "metadata": json.dumps(metadata or {"source": "db_upload_menu"}),
-            "process": "true",
-            "process_in_background": "false",
-        }
-        
         with file_path.open("rb") as f:
-            files = {"file": (file_path.name, f, "application/pdf")}
-            response = requests.post(
+            # MultipartEncoder streams the body from disk instead of building it in memory
+            encoder = MultipartEncoder(fields={
+                "metadata": json.dumps(metadata or {"source": "db_upload_menu"}),
+                "process": "true",
+                "process_in_background": "false",
+                "file": (file_path.name, f, "application/pdf"),
+            })
+            response = self.session.post(
                 url_upload, 
-                headers=self.headers, 
-                data=data, 
-                files=files, 
+                headers={"Content-Type": encoder.content_type}, 
+                data=encoder, 
                 timeout=120
             )
         
@@ -43,9 +51,9 @@ class OpenWebUIUploader:
         """Add an uploaded file to the knowledge base"""
         url_add = f"{self.base_url}/api/v1/knowledge/{self.kb_id}/file/add"
         
-        add_response = requests.post(
+        add_response = self.session.post(
             url_add,
-            headers={**self.headers, "Content-Type": "application/json"},
+            headers={"Content-Type": "application/json"},
             data=json.dumps({"file_id": file_id}),
             timeout=120
         )
@@ -59,9 +67,8 @@ class OpenWebUIUploader:
             logging.warning(f"File might be duplicate, attempting merge for file_id {file_id}")
             
             # Get current KB state
-            kb = requests.get(
+            kb = self.session.get(
                 f"{self.base_url}/api/v1/knowledge/{self.kb_id}",
-                headers=self.headers,
                 timeout=60
             ).json()
             
@@ -77,9 +84,9 @@ class OpenWebUIUploader:
                     "access_control": kb.get("access_control"),
                 }
                 
-                update_response = requests.post(
+                update_response = self.session.post(
                     f"{self.base_url}/api/v1/knowledge/{self.kb_id}/update",
-                    headers={**self.headers, "Content-Type": "application/json"},
+                    headers={"Content-Type": "application/json"},
                     data=json.dumps(body),
                     timeout=120
                 )
@@ -0,0 +1,84 @@
+"""
+Thumbnail rendering for crawled PDFs.
+
+This module has no import-time side effects so that process-pool workers can
+import it without re-running the backend's startup cleanup.
+"""
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Lossy WebP is several times smaller than PNG at thumbnail sizes
+THUMBNAIL_EXT = ".webp"
+
+def generate_thumbnail(pdf_path: Path, thumbnail_dir: Path) -> Optional[Path]:
+    """Generate a thumbnail for a PDF file"""
+    try:
+        import fitz  # PyMuPDF
+        from PIL import Image
+
+        thumbnail_dir.mkdir(parents=True, exist_ok=True)
+        output_path = thumbnail_dir / f"{pdf_path.stem}{THUMBNAIL_EXT}"
+
+        # Check if thumbnail already exists
+        if output_path.exists():
+            logging.debug("Thumbnail already exists: %s", output_path)
+            return output_path
+
+        logging.debug("Generating thumbnail for: %s", pdf_path)
+
+        # Render the first page in-process instead of forking pdftoppm
+        doc = fitz.open(str(pdf_path))
+        try:
+            if doc.page_count == 0:
+                logging.error(f"No pages found in PDF: {pdf_path}")
+                return None
+
+            page = doc.load_page(0)
+            max_width, max_height = 200, 250
+            # Render straight at thumbnail size (maintaining aspect ratio) so no resample pass is needed
+            zoom = min(max_width / page.rect.width, max_height / page.rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            # Wrap the pixmap's buffer directly (no bytes copy); rows may be padded to stride
+            img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+        finally:
+            # Release the document even when rendering fails
+            doc.close()
+
+        # method=0 is the fastest WebP encoder; q75 is indistinguishable at this size.
+        # Write beside the target and rename so a half-written file is never served
+        # and concurrent renders of the same PDF can't interleave
+        tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+        img.save(tmp_path, "WEBP", quality=75, method=0)
+        os.replace(tmp_path, output_path)
+
+        logging.debug("Successfully created thumbnail: %s", output_path)
+        return output_path
+
+    except ImportError as e:
+        logging.error(f"PyMuPDF/Pillow not installed: {e}")
+        logging.error("Install with: pip install pymupdf pillow")
+        return None
+    except Exception as e:
+        logging.error(f"Failed to create thumbnail for {pdf_path.name}: {e}")
+        return None
+
+def init_worker():
+    """Process-pool initializer: load PyMuPDF and Pillow once per worker process"""
+    try:
+        import fitz  # noqa: F401
+        from PIL import Image  # noqa: F401
+    except ImportError:
+        # generate_thumbnail reports the missing dependency per PDF
+        pass
+
+def render_thumbs_worker(args: Tuple[List[str], str]) -> List[Optional[str]]:
+    """Process-pool entry point: render a batch of thumbnails from (pdf_paths, thumbnail_dir)"""
+    pdf_paths, thumbnail_dir = args
+    thumbnail_dir = Path(thumbnail_dir)
+    results = []
+    for pdf_path in pdf_paths:
+        result = generate_thumbnail(Path(pdf_path), thumbnail_dir)
+        results.append(str(result) if result else None)
+    return results
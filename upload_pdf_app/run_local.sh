@@ -36,7 +36,7 @@ fi
 
 # Run FastAPI backend
 echo "Starting FastAPI backend on http://$LOCAL_IP:$BACKEND_PORT..."
-uvicorn backend:app --host 0.0.0.0 --port $BACKEND_PORT --reload &
+uvicorn backend:app --host 0.0.0.0 --port $BACKEND_PORT --loop uvloop --http httptools --reload &
 BACKEND_PID=$!
 sleep 2
 